@@ -0,0 +1,3 @@
+# Las pruebas de ``l10n_cr_edi`` necesitan un servidor Odoo y se ejecutan con
+# su propio runner (``odoo-bin --test-tags /l10n_cr_edi``).
+collect_ignore = ["l10n_cr_edi"]
@@ -1,7 +1,9 @@
 """Módulo de ayuda para construir comprobantes electrónicos de Costa Rica (v4.4)."""
 
+from importlib import import_module
+from typing import TYPE_CHECKING
+
 from .exceptions import ValidationError
-from .hacienda_api import HaciendaAPI, HaciendaAPIError
 from .models import (
     ElectronicInvoice,
     Emisor,
@@ -20,8 +22,35 @@ from .models import (
     Location,
 )
 from .validation import validate_invoice
-from .signing import sign_xml_with_p12, CertificateError
-from .xml_builder import invoice_to_xml, render_invoice
+from .xml_builder import invoice_to_xml, render_invoice, render_invoice_bytes, render_invoices_bytes, stream_invoice
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .hacienda_api import HaciendaAPI, HaciendaAPIError
+    from .signing import CertificateError, sign_xml_with_key_cert, sign_xml_with_p12
+
+# Los submódulos de firma y envío cargan ``cryptography`` y el cliente HTTP;
+# se importan en el primer acceso (PEP 562) para abaratar ``import fe_cr``.
+_LAZY_ATTRIBUTES = {
+    "CertificateError": "signing",
+    "HaciendaAPI": "hacienda_api",
+    "HaciendaAPIError": "hacienda_api",
+    "sign_xml_with_key_cert": "signing",
+    "sign_xml_with_p12": "signing",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "CertificateError",
@@ -44,7 +73,11 @@ __all__ = [
     "TaxExoneration",
     "ValidationError",
     "invoice_to_xml",
+    "sign_xml_with_key_cert",
     "sign_xml_with_p12",
     "render_invoice",
+    "render_invoice_bytes",
+    "render_invoices_bytes",
+    "stream_invoice",
     "validate_invoice",
 ]
@@ -0,0 +1,41 @@
+"""Adaptadores para dependencias opcionales más rápidas que la biblioteca estándar."""
+
+from __future__ import annotations
+
+import base64
+import json
+from typing import Any
+
+try:  # pragma: no cover - depende del entorno
+    import pybase64 as _pybase64
+except ImportError:  # pragma: no cover - depende del entorno
+    _pybase64 = None
+
+try:  # pragma: no cover - depende del entorno
+    import orjson as _orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    _orjson = None
+
+
+def b64encode_text(data: bytes) -> str:
+    """Codifica ``data`` en base64 y devuelve el resultado como ``str``.
+
+    Utiliza :mod:`pybase64` (SIMD) cuando está instalado y recurre a
+    :mod:`base64` en caso contrario.
+    """
+
+    if _pybase64 is not None:
+        return _pybase64.b64encode_as_string(data)
+    return base64.b64encode(data).decode("ascii")
+
+
+def json_dumps(data: Any) -> bytes:
+    """Serializa ``data`` como JSON UTF-8 compacto, con :mod:`orjson` si está disponible.
+
+    El respaldo con :mod:`json` produce la misma salida que :mod:`orjson`: sin
+    espacios entre separadores y sin escapar caracteres no ASCII.
+    """
+
+    if _orjson is not None:
+        return _orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
@@ -2,24 +2,38 @@
 
 from __future__ import annotations
 
-import base64
 import json
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Dict, Optional
+from http.cookiejar import DefaultCookiePolicy
+from types import MappingProxyType
+from typing import Any, Dict, Optional, TypedDict
 from urllib import error, request
 
+try:  # pragma: no cover - depende del entorno
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+except ImportError:  # pragma: no cover - depende del entorno
+    requests = None
+
+from ._compat import b64encode_text, json_dumps
 from .exceptions import ValidationError
 from .models import ElectronicInvoice, Identification
-from .xml_builder import render_invoice
+from .xml_builder import render_invoice_bytes
 
-_ENVIRONMENT_URLS = {
+_ENVIRONMENT_URLS = MappingProxyType({
     "production": "https://api.comprobanteselectronicos.go.cr/recepcion/v1",
     "prod": "https://api.comprobanteselectronicos.go.cr/recepcion/v1",
     "testing": "https://api-sandbox.comprobanteselectronicos.go.cr/recepcion/v1",
     "test": "https://api-sandbox.comprobanteselectronicos.go.cr/recepcion/v1",
     "sandbox": "https://api-sandbox.comprobanteselectronicos.go.cr/recepcion/v1",
-}
+})
+
+
+class _IdentificationPayload(TypedDict):
+    tipoIdentificacion: str
+    numeroIdentificacion: str
 
 
 class HaciendaAPIError(Exception):
@@ -44,7 +58,7 @@ class _HTTPResponse:
 
 class _UrllibSession:
     def post(self, url: str, *, json_body: Dict[str, Any], headers: Optional[Dict[str, str]], timeout: float | None) -> _HTTPResponse:
-        data = json.dumps(json_body).encode("utf-8")
+        data = json_dumps(json_body)
         headers = {"Content-Type": "application/json", **(headers or {})}
         req = request.Request(url, data=data, headers=headers, method="POST")
         try:
@@ -66,6 +80,43 @@ class _UrllibSession:
             return _HTTPResponse(exc.code, body, dict(exc.headers or {}))
 
 
+class _RequestsSession:
+    """Sesión HTTP con conexiones persistentes (keep-alive) hacia Hacienda."""
+
+    def __init__(self) -> None:
+        self._session = requests.Session()
+        # La sesión se comparte entre compañías y hilos: no se guardan cookies
+        # para que ninguna respuesta viaje en las solicitudes de otro emisor.
+        self._session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        retries = Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), raise_on_status=False)
+        self._session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retries))
+
+    def post(self, url: str, *, json_body: Dict[str, Any], headers: Optional[Dict[str, str]], timeout: float | None) -> _HTTPResponse:
+        headers = {"Content-Type": "application/json", **(headers or {})}
+        resp = self._session.post(url, data=json_dumps(json_body), headers=headers, timeout=timeout)
+        return _HTTPResponse(resp.status_code, resp.content, dict(resp.headers))
+
+    def get(self, url: str, *, headers: Optional[Dict[str, str]], timeout: float | None) -> _HTTPResponse:
+        resp = self._session.get(url, headers=headers, timeout=timeout)
+        return _HTTPResponse(resp.status_code, resp.content, dict(resp.headers))
+
+
+_DEFAULT_SESSION: _RequestsSession | _UrllibSession | None = None
+
+
+def _default_session() -> _RequestsSession | _UrllibSession:
+    """Devuelve la sesión compartida del módulo, creándola en el primer uso.
+
+    Con :mod:`requests` instalado las conexiones TLS se reutilizan entre
+    envíos; de lo contrario se utiliza :mod:`urllib` sin persistencia.
+    """
+
+    global _DEFAULT_SESSION
+    if _DEFAULT_SESSION is None:
+        _DEFAULT_SESSION = _RequestsSession() if requests is not None else _UrllibSession()
+    return _DEFAULT_SESSION
+
+
 @dataclass
 class HaciendaAPI:
     """Cliente HTTP sencillo para la API de recepción v1."""
@@ -75,11 +126,11 @@ class HaciendaAPI:
     session: Any | None = None
 
     def __post_init__(self) -> None:
-        env_key = self.environment.lower()
-        if env_key not in _ENVIRONMENT_URLS:
+        base_url = _ENVIRONMENT_URLS.get(self.environment.lower())
+        if base_url is None:
             raise ValueError(f"Ambiente de Hacienda desconocido: {self.environment}")
-        self._base_url = _ENVIRONMENT_URLS[env_key]
-        self._session = self.session or _UrllibSession()
+        self._base_url = base_url
+        self._session = self.session or _default_session()
         self._token: Optional[str] = None
 
     # ------------------------------------------------------------------
@@ -121,14 +172,14 @@ class HaciendaAPI:
         if not self._token:
             raise HaciendaAPIError("No se ha autenticado con Hacienda")
 
-        xml_content = xml or render_invoice(invoice)
+        xml_content = xml or render_invoice_bytes(invoice)
         xml_bytes = xml_content.encode("utf-8") if isinstance(xml_content, str) else xml_content
 
         payload: Dict[str, Any] = {
             "clave": invoice.clave,
             "fecha": _format_datetime(invoice.fecha_emision),
             "emisor": _identification_payload(invoice.emisor.identificacion),
-            "comprobanteXml": base64.b64encode(xml_bytes).decode("ascii"),
+            "comprobanteXml": b64encode_text(xml_bytes),
         }
 
         if invoice.receptor and invoice.receptor.identificacion:
@@ -179,7 +230,8 @@ class HaciendaAPI:
         return data
 
 
-def _identification_payload(identificacion: Identification) -> Dict[str, str]:
+def _identification_payload(identificacion: Identification) -> _IdentificationPayload:
+    # Literal con claves fijas: orjson lo serializa por su ruta rápida de dict.
     return {
         "tipoIdentificacion": identificacion.tipo,
         "numeroIdentificacion": identificacion.numero,
@@ -187,8 +239,7 @@ def _identification_payload(identificacion: Identification) -> Dict[str, str]:
 
 
 def _format_datetime(value: datetime) -> str:
-    if isinstance(value, datetime):
-        if value.tzinfo is None:
-            return value.isoformat(timespec="seconds")
+    try:
         return value.isoformat(timespec="seconds")
-    raise ValidationError("Fecha de emisión inválida", field="FechaEmision")
+    except (AttributeError, TypeError) as exc:  # ``date``, ``str`` u otros tipos
+        raise ValidationError("Fecha de emisión inválida", field="FechaEmision") from exc
@@ -6,7 +6,10 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Iterable, List, Optional, Sequence
+from operator import attrgetter
+from typing import Iterable, Optional, Sequence, Tuple
+
+_ZERO = Decimal("0")
 
 
 class SaleCondition(str, Enum):
@@ -144,28 +147,28 @@ class InvoiceSummary:
 
     moneda: str
     tipo_cambio: Optional[Decimal] = None
-    total_serv_gravados: Decimal = Decimal("0")
-    total_serv_exentos: Decimal = Decimal("0")
-    total_serv_exonerado: Decimal = Decimal("0")
-    total_serv_no_sujeto: Decimal = Decimal("0")
-    total_serv_otros: Decimal = Decimal("0")
-    total_mercancias_gravadas: Decimal = Decimal("0")
-    total_mercancias_exentas: Decimal = Decimal("0")
-    total_mercancias_exoneradas: Decimal = Decimal("0")
-    total_mercancias_no_sujeto: Decimal = Decimal("0")
-    total_mercancias_otros: Decimal = Decimal("0")
-    total_gravado: Decimal = Decimal("0")
-    total_exento: Decimal = Decimal("0")
-    total_exonerado: Decimal = Decimal("0")
-    total_no_sujeto: Decimal = Decimal("0")
-    total_otros: Decimal = Decimal("0")
-    total_venta: Decimal = Decimal("0")
-    total_descuentos: Decimal = Decimal("0")
-    total_venta_neta: Decimal = Decimal("0")
-    total_impuestos: Decimal = Decimal("0")
-    total_iva_devuelto: Decimal = Decimal("0")
-    total_otros_cargos: Decimal = Decimal("0")
-    total_comprobante: Decimal = Decimal("0")
+    total_serv_gravados: Decimal = _ZERO
+    total_serv_exentos: Decimal = _ZERO
+    total_serv_exonerado: Decimal = _ZERO
+    total_serv_no_sujeto: Decimal = _ZERO
+    total_serv_otros: Decimal = _ZERO
+    total_mercancias_gravadas: Decimal = _ZERO
+    total_mercancias_exentas: Decimal = _ZERO
+    total_mercancias_exoneradas: Decimal = _ZERO
+    total_mercancias_no_sujeto: Decimal = _ZERO
+    total_mercancias_otros: Decimal = _ZERO
+    total_gravado: Decimal = _ZERO
+    total_exento: Decimal = _ZERO
+    total_exonerado: Decimal = _ZERO
+    total_no_sujeto: Decimal = _ZERO
+    total_otros: Decimal = _ZERO
+    total_venta: Decimal = _ZERO
+    total_descuentos: Decimal = _ZERO
+    total_venta_neta: Decimal = _ZERO
+    total_impuestos: Decimal = _ZERO
+    total_iva_devuelto: Decimal = _ZERO
+    total_otros_cargos: Decimal = _ZERO
+    total_comprobante: Decimal = _ZERO
 
 
 @dataclass(slots=True)
@@ -193,8 +196,18 @@ class ElectronicInvoice:
     informacion_referencia: Sequence[ReferenceInformation] = field(default_factory=tuple)
     otros_cargos: Sequence[OtherCharge] = field(default_factory=tuple)
 
-    def sorted_medios_pago(self) -> List[PaymentMethod]:
-        return sorted(set(self.medios_pago), key=lambda m: m.value)
+    def __post_init__(self) -> None:
+        # Las colecciones se fijan como tuplas para que validación y render
+        # las recorran sin depender del tipo de secuencia recibido.
+        self.detalle_servicio = tuple(self.detalle_servicio)
+        self.medios_pago = tuple(self.medios_pago)
+        self.informacion_referencia = tuple(self.informacion_referencia)
+        self.otros_cargos = tuple(self.otros_cargos)
+
+    def sorted_medios_pago(self) -> Tuple[PaymentMethod, ...]:
+        # Son a lo sumo cuatro medios: se ordenan en cada llamada, así que
+        # reasignar ``medios_pago`` nunca deja un resultado desactualizado.
+        return tuple(sorted(set(self.medios_pago), key=attrgetter("value")))
 
     def iter_detalle(self) -> Iterable[InvoiceLine]:
-        yield from self.detalle_servicio
+        return self.detalle_servicio
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import base64
-from typing import Iterable, Optional
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Sequence
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
@@ -11,11 +14,30 @@ from cryptography.hazmat.primitives.asymmetric import padding
 from cryptography.hazmat.primitives.serialization import pkcs12
 from lxml import etree
 
+from ._compat import b64encode_text
+
 
 class CertificateError(Exception):
     """Errores relacionados con la carga del certificado P12."""
 
 
+# Los certificados descifrados se conservan en memoria del proceso (incluida la
+# llave privada) para no repetir la derivación PBKDF2 en cada firma. Las
+# entradas se indexan por un hash del archivo y la contraseña, nunca por los
+# valores en claro.
+_PKCS12_CACHE_SIZE = 8
+_pkcs12_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+_pkcs12_cache_lock = threading.Lock()
+
+
+def _pkcs12_cache_key(p12_data: bytes, password_bytes: Optional[bytes]) -> bytes:
+    password_marker = b"\x00" if password_bytes is None else b"\x01" + password_bytes
+    return (
+        hashlib.blake2b(p12_data, digest_size=16).digest()
+        + hashlib.blake2b(password_marker, digest_size=16).digest()
+    )
+
+
 def _load_pkcs12(p12_data: bytes, password: str | bytes | None):
     password_bytes: Optional[bytes]
     if password is None:
@@ -25,14 +47,33 @@ def _load_pkcs12(p12_data: bytes, password: str | bytes | None):
     else:
         password_bytes = password
 
+    cache_key = _pkcs12_cache_key(p12_data, password_bytes)
+    with _pkcs12_cache_lock:
+        cached = _pkcs12_cache.get(cache_key)
+        if cached is not None:
+            _pkcs12_cache.move_to_end(cache_key)
+            return cached
+
     private_key, cert, additional_certs = pkcs12.load_key_and_certificates(p12_data, password_bytes)
     if private_key is None or cert is None:
         raise CertificateError("El certificado P12 no contiene llave privada o certificado")
-    return private_key, cert, additional_certs or []
+    # La cadena en base64 y el nombre de la llave se derivan una sola vez y se
+    # guardan junto a la llave: son idénticos en todas las firmas.
+    loaded = (
+        private_key,
+        tuple(_cert_b64(item) for item in (cert, *(additional_certs or ()))),
+        cert.subject.rfc4514_string(),
+    )
 
+    with _pkcs12_cache_lock:
+        _pkcs12_cache[cache_key] = loaded
+        while len(_pkcs12_cache) > _PKCS12_CACHE_SIZE:
+            _pkcs12_cache.popitem(last=False)
+    return loaded
 
-def _pem_bytes(cert: x509.Certificate) -> bytes:
-    return cert.public_bytes(serialization.Encoding.PEM)
+
+def _cert_b64(cert: x509.Certificate) -> str:
+    return b64encode_text(cert.public_bytes(serialization.Encoding.DER))
 
 
 def sign_xml_with_p12(xml_content: bytes | str, p12_data: bytes | str, password: str | bytes | None) -> bytes:
@@ -66,22 +107,54 @@ def sign_xml_with_p12(xml_content: bytes | str, p12_data: bytes | str, password:
     else:
         p12_bytes = p12_data
 
-    private_key, certificate, extra_certs = _load_pkcs12(p12_bytes, password)
+    private_key, certificates_b64, key_name = _load_pkcs12(p12_bytes, password)
+    return _sign_xml_bytes(xml_bytes, private_key, certificates_b64, key_name)
+
+
+def sign_xml_with_key_cert(
+    xml_content: bytes | str,
+    private_key_pem: bytes,
+    certificate_pem: bytes,
+    password: str | bytes | None = None,
+) -> bytes:
+    """Firma un XML con una llave privada y un certificado en formato PEM.
 
+    Equivale a :func:`sign_xml_with_p12` cuando la llave y el certificado se
+    guardan por separado; evita el descifrado PBKDF2 del contenedor P12.
+    """
+
+    if isinstance(xml_content, str):
+        xml_bytes = xml_content.encode("utf-8")
+    else:
+        xml_bytes = xml_content
+    if isinstance(password, str):
+        password = password.encode("utf-8")
+
+    try:
+        private_key = serialization.load_pem_private_key(private_key_pem, password)
+        certificate = x509.load_pem_x509_certificate(certificate_pem)
+    except (TypeError, ValueError) as exc:
+        raise CertificateError("La llave o el certificado PEM no son válidos") from exc
+
+    return _sign_xml_bytes(
+        xml_bytes,
+        private_key,
+        (_cert_b64(certificate),),
+        certificate.subject.rfc4514_string(),
+    )
+
+
+def _sign_xml_bytes(xml_bytes: bytes, private_key, certificates_b64: Sequence[str], key_name: str) -> bytes:
     try:
         xml_tree = etree.fromstring(xml_bytes)
     except etree.XMLSyntaxError as exc:  # pragma: no cover - lxml mensaje explicativo
         raise ValueError("El XML proporcionado no es válido") from exc
 
-    cert_pem = _pem_bytes(certificate)
-    ca_pems: Iterable[bytes] = (_pem_bytes(cert) for cert in extra_certs)
-
     signed_root = _sign_enveloped(
         xml_tree,
         private_key=private_key,
-        certificate_pem=cert_pem,
-        ca_pems=list(ca_pems),
-        key_name=certificate.subject.rfc4514_string(),
+        certificates_b64=certificates_b64,
+        key_name=key_name,
     )
 
     return etree.tostring(signed_root, xml_declaration=True, encoding="utf-8")
@@ -91,8 +164,7 @@ def _sign_enveloped(
     xml_root: etree._Element,
     *,
     private_key,
-    certificate_pem: bytes,
-    ca_pems: list[bytes],
+    certificates_b64: Sequence[str],
     key_name: str,
 ) -> etree._Element:
     """Firmar ``xml_root`` usando un ``Signature`` enveloped RSA-SHA256.
@@ -139,7 +211,14 @@ def _sign_enveloped(
     )
 
     digest_value = etree.SubElement(reference, etree.QName(ds_ns, "DigestValue"))
-    digest_value.text = _digest_base64(xml_root)
+    # El digest debe usar C14N exclusivo 1.0 (declarado en los Transform);
+    # ``method="c14n2"`` no admite el modo exclusivo. La firma se agrega
+    # después, por lo que esta única serialización ya es la entrada final.
+    # No se conserva una referencia: el búfer canónico se libera en cuanto
+    # se calcula el hash, antes de serializar ``SignedInfo``.
+    digest_value.text = _digest_base64(
+        etree.tostring(xml_root, method="c14n", exclusive=True, with_comments=False)
+    )
 
     signed_info_c14n = etree.tostring(
         signed_info,
@@ -156,34 +235,20 @@ def _sign_enveloped(
     key_name_el.text = key_name
 
     x509_data = etree.SubElement(key_info, etree.QName(ds_ns, "X509Data"))
-    etree.SubElement(x509_data, etree.QName(ds_ns, "X509Certificate")).text = _pem_body_b64(
-        certificate_pem
-    )
-    for ca_pem in ca_pems:
-        etree.SubElement(x509_data, etree.QName(ds_ns, "X509Certificate")).text = _pem_body_b64(
-            ca_pem
-        )
+    for certificate_b64 in certificates_b64:
+        etree.SubElement(x509_data, etree.QName(ds_ns, "X509Certificate")).text = certificate_b64
 
     xml_root.append(signature_el)
     return xml_root
 
 
-def _digest_base64(xml_root: etree._Element) -> str:
-    canonical = etree.tostring(xml_root, method="c14n", exclusive=True, with_comments=False)
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(canonical)
-    return base64.b64encode(digest.finalize()).decode("ascii")
+def _digest_base64(canonical: bytes) -> str:
+    return b64encode_text(hashlib.sha256(canonical).digest())
 
 
 def _signature_base64(signed_info: bytes, private_key) -> str:
     signature = private_key.sign(signed_info, padding.PKCS1v15(), hashes.SHA256())
-    return base64.b64encode(signature).decode("ascii")
-
-
-def _pem_body_b64(pem_bytes: bytes) -> str:
-    lines = pem_bytes.decode("ascii").splitlines()
-    body = [line for line in lines if not line.startswith("---") and line.strip()]
-    return "".join(body)
+    return b64encode_text(signature)
 
 
-__all__ = ["sign_xml_with_p12", "CertificateError"]
+__all__ = ["sign_xml_with_p12", "sign_xml_with_key_cert", "CertificateError"]
@@ -2,17 +2,22 @@
 
 from __future__ import annotations
 
-import re
 from datetime import datetime
-from decimal import Decimal
 from typing import Sequence
 
 from .exceptions import ValidationError
 from .models import ElectronicInvoice, Identification, InvoiceLine, PaymentMethod, SaleCondition
 
-_CLAVE_RE = re.compile(r"^[0-9]{50}$")
-_CONSECUTIVO_RE = re.compile(r"^[0-9]{20}$")
-_IDENTIFICACION_RE = re.compile(r"^[0-9A-Za-z]{9,20}$")
+_TIPOS_IDENTIFICACION = frozenset({"01", "02", "03", "04"})
+
+
+def _is_digits(value: str, length: int) -> bool:
+    # ``isascii`` excluye dígitos Unicode que ``isdigit`` aceptaría (p. ej. "²").
+    return len(value) == length and value.isascii() and value.isdigit()
+
+
+def _is_alphanumeric(value: str, min_length: int, max_length: int) -> bool:
+    return min_length <= len(value) <= max_length and value.isascii() and value.isalnum()
 
 
 def _ensure(predicate: bool, message: str, *, field: str | None = None) -> None:
@@ -21,9 +26,9 @@ def _ensure(predicate: bool, message: str, *, field: str | None = None) -> None:
 
 
 def validate_identification(identificacion: Identification, *, field: str) -> None:
-    _ensure(identificacion.tipo in {"01", "02", "03", "04"}, "Tipo de identificación inválido", field=field)
+    _ensure(identificacion.tipo in _TIPOS_IDENTIFICACION, "Tipo de identificación inválido", field=field)
     _ensure(
-        bool(_IDENTIFICACION_RE.fullmatch(identificacion.numero)),
+        _is_alphanumeric(identificacion.numero, 9, 20),
         "Número de identificación inválido",
         field=field,
     )
@@ -33,22 +38,46 @@ def validate_medios_pago(medios_pago: Sequence[PaymentMethod]) -> None:
     _ensure(len(medios_pago) > 0, "Debe indicar al menos un medio de pago", field="MedioPago")
 
 
+_LINE_NON_NEGATIVE = (
+    ("cantidad", "La cantidad debe ser mayor o igual a cero", "Cantidad"),
+    ("precio_unitario", "El precio unitario debe ser mayor o igual a cero", "PrecioUnitario"),
+    ("monto_total", "El monto total debe ser mayor o igual a cero", "MontoTotal"),
+    ("sub_total", "El subtotal debe ser mayor o igual a cero", "SubTotal"),
+)
+
+
+def _raise_line_error(linea: InvoiceLine) -> None:
+    """Localiza el campo inválido de ``linea``; solo se usa en la ruta de error."""
+
+    if linea.numero_linea <= 0:
+        raise ValidationError("El número de línea debe ser positivo", field="NumeroLinea")
+    for attr, message, field in _LINE_NON_NEGATIVE:
+        if getattr(linea, attr) < 0:
+            raise ValidationError(message, field=field)
+
+
 def validate_invoice_line(linea: InvoiceLine) -> None:
-    _ensure(linea.numero_linea > 0, "El número de línea debe ser positivo", field="NumeroLinea")
-    _ensure(linea.cantidad >= 0, "La cantidad debe ser mayor o igual a cero", field="Cantidad")
-    _ensure(linea.precio_unitario >= 0, "El precio unitario debe ser mayor o igual a cero", field="PrecioUnitario")
-    _ensure(linea.monto_total >= 0, "El monto total debe ser mayor o igual a cero", field="MontoTotal")
-    _ensure(linea.sub_total >= 0, "El subtotal debe ser mayor o igual a cero", field="SubTotal")
-    if linea.base_imponible is not None:
-        _ensure(linea.base_imponible >= 0, "La base imponible debe ser mayor o igual a cero", field="BaseImponible")
-    if linea.impuesto is not None:
-        _ensure(linea.impuesto.monto >= 0, "Monto de impuesto inválido", field="Impuesto/Monto")
-        _ensure(Decimal("0") <= linea.impuesto.tarifa <= Decimal("100"), "Tarifa de impuesto inválida", field="Impuesto/Tarifa")
+    if not (
+        linea.numero_linea > 0
+        and linea.cantidad >= 0
+        and linea.precio_unitario >= 0
+        and linea.monto_total >= 0
+        and linea.sub_total >= 0
+    ):
+        _raise_line_error(linea)
+    if linea.base_imponible is not None and linea.base_imponible < 0:
+        raise ValidationError("La base imponible debe ser mayor o igual a cero", field="BaseImponible")
+    impuesto = linea.impuesto
+    if impuesto is not None:
+        if impuesto.monto < 0:
+            raise ValidationError("Monto de impuesto inválido", field="Impuesto/Monto")
+        if not 0 <= impuesto.tarifa <= 100:
+            raise ValidationError("Tarifa de impuesto inválida", field="Impuesto/Tarifa")
 
 
 def validate_invoice(invoice: ElectronicInvoice) -> None:
-    _ensure(bool(_CLAVE_RE.fullmatch(invoice.clave)), "La clave debe tener 50 dígitos", field="Clave")
-    _ensure(bool(_CONSECUTIVO_RE.fullmatch(invoice.numero_consecutivo)), "El consecutivo debe tener 20 dígitos", field="NumeroConsecutivo")
+    _ensure(_is_digits(invoice.clave, 50), "La clave debe tener 50 dígitos", field="Clave")
+    _ensure(_is_digits(invoice.numero_consecutivo, 20), "El consecutivo debe tener 20 dígitos", field="NumeroConsecutivo")
     _ensure(isinstance(invoice.fecha_emision, datetime), "Fecha de emisión inválida", field="FechaEmision")
     validate_identification(invoice.emisor.identificacion, field="Emisor/Identificacion")
 
@@ -56,14 +85,16 @@ def validate_invoice(invoice: ElectronicInvoice) -> None:
         validate_identification(invoice.receptor.identificacion, field="Receptor/Identificacion")
 
     _ensure(isinstance(invoice.condicion_venta, SaleCondition), "Condición de venta inválida", field="CondicionVenta")
-    medios_pago_tuple = tuple(invoice.medios_pago)
-    validate_medios_pago(medios_pago_tuple)
+    validate_medios_pago(invoice.medios_pago)
 
     numeros_linea: set[int] = set()
+    registrar_linea = numeros_linea.add
     for linea in invoice.iter_detalle():
         validate_invoice_line(linea)
-        _ensure(linea.numero_linea not in numeros_linea, "Numero de línea duplicado", field="NumeroLinea")
-        numeros_linea.add(linea.numero_linea)
+        numero = linea.numero_linea
+        if numero in numeros_linea:
+            raise ValidationError("Numero de línea duplicado", field="NumeroLinea")
+        registrar_linea(numero)
 
     resumen = invoice.resumen
     _ensure(resumen.total_comprobante >= 0, "Total del comprobante inválido", field="ResumenFactura/TotalComprobante")
@@ -2,10 +2,23 @@
 
 from __future__ import annotations
 
+import re
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
-from typing import Iterable
-from xml.etree.ElementTree import Element, SubElement, tostring
+from functools import lru_cache, partial
+from typing import Iterable, List, Sequence
+from xml.sax.saxutils import escape
+
+try:
+    from lxml.etree import Element, SubElement, tostring
+
+    _HAS_LXML = True
+except ImportError:  # pragma: no cover - lxml es dependencia declarada
+    # ``xml.etree.ElementTree`` ya enlaza los tipos del acelerador C
+    # ``_elementtree`` al importarse; ``cElementTree`` no existe desde 3.9.
+    from xml.etree.ElementTree import Element, SubElement, tostring
+
+    _HAS_LXML = False
 
 from .models import (
     ElectronicInvoice,
@@ -20,14 +33,65 @@ _NAMESPACE = "https://cdn.comprobanteselectronicos.go.cr/xml-schemas/v4.4/factur
 _SCHEMA_LOCATION = (
     "https://cdn.comprobanteselectronicos.go.cr/xml-schemas/v4.4/facturaElectronica.xsd"
 )
+_XSI_NAMESPACE = "http://www.w3.org/2001/XMLSchema-instance"
+# Por debajo de este tamaño de lote el arranque de procesos cuesta más que el render.
+_PARALLEL_RENDER_THRESHOLD = 64
+# Revisión del formato de salida: se incrementa cuando cambian los bytes que
+# producen los renderers, para que los XML guardados con una versión anterior
+# no se reutilicen.
+RENDER_REVISION = 1
+_ROOT_TAG = f"{{{_NAMESPACE}}}FacturaElectronica"
+_NSMAP = {None: _NAMESPACE, "xsi": _XSI_NAMESPACE}
+_SCHEMA_LOCATION_ATTR = f"{{{_XSI_NAMESPACE}}}schemaLocation"
+_SCHEMA_LOCATION_VALUE = f"{_NAMESPACE} {_SCHEMA_LOCATION}"
+# Atributos equivalentes para el respaldo con ``xml.etree`` (se copian al crear).
+_ROOT_ATTRIB = {
+    "xmlns": _NAMESPACE,
+    "xmlns:xsi": _XSI_NAMESPACE,
+    "xsi:schemaLocation": _SCHEMA_LOCATION_VALUE,
+}
+# Encabezado idéntico al que produce ``tostring`` de lxml en UTF-8.
+_STREAM_PROLOG = (
+    "<?xml version='1.0' encoding='utf-8'?>\n"
+    f'<FacturaElectronica xmlns="{_NAMESPACE}" xmlns:xsi="{_XSI_NAMESPACE}" '
+    f'xsi:schemaLocation="{_SCHEMA_LOCATION_VALUE}">'
+)
+# libxml2 también escapa el retorno de carro en el contenido de texto.
+_TEXT_ENTITIES = {"\r": "&#13;"}
+# Caracteres fuera del rango ``Char`` de XML 1.0; lxml los rechaza al asignarlos.
+_INVALID_XML_CHARS = re.compile("[^\t\n\r\x20-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]")
+_INVALID_XML_MESSAGE = "All strings must be XML compatible: Unicode or ASCII, no NULL bytes or control characters"
+
+
+# Plantillas de ``quantize`` para las precisiones usadas por el esquema.
+_QUANTIZERS = {places: Decimal(1).scaleb(-places) for places in range(9)}
 
 
 def _decimal_to_text(value: Decimal | float | int, *, places: int = 5) -> str:
     if not isinstance(value, Decimal):
         value = Decimal(str(value))
-    quantized = value.quantize(Decimal((0, (1,), -places)), rounding=ROUND_HALF_UP)
-    # El formato "f" evita la notación científica
-    return format(quantized.normalize(), "f")
+    # ``Decimal("-0") == Decimal("0")`` comparten hash, así que el signo forma
+    # parte de la llave para no devolver "-0" donde corresponde "0".
+    return _decimal_to_text_cached(value, places, value.is_signed())
+
+
+@lru_cache(maxsize=4096)
+def _decimal_to_text_cached(value: Decimal, places: int, signed: bool) -> str:
+    quantizer = _QUANTIZERS.get(places) or Decimal((0, (1,), -places))
+    quantized = value.quantize(quantizer, rounding=ROUND_HALF_UP)
+    return _fast_dec_str(quantized, places)
+
+
+def _fast_dec_str(quantized: Decimal, places: int) -> str:
+    # Con exponente ``-places`` ``str`` ya da notación posicional; basta con
+    # recortar los ceros finales que ``normalize`` eliminaría.
+    text = str(quantized)
+    if "E" in text:
+        # Valores muy pequeños: el formato "f" evita la notación científica
+        return format(quantized.normalize(), "f")
+    if places:
+        text = text.rstrip("0").rstrip(".")
+    return text
 
 
 def _text(element: Element, tag: str, value: str) -> Element:
@@ -68,59 +132,58 @@ def _append_other_charge(parent: Element, tag: str, cargo: OtherCharge) -> None:
 
 def _append_tax(parent: Element, tax: Tax) -> None:
     node = SubElement(parent, "Impuesto")
-    _text(node, "Codigo", tax.codigo)
+    SubElement(node, "Codigo").text = tax.codigo
     if tax.codigo_tarifa:
-        _text(node, "CodigoTarifa", tax.codigo_tarifa)
-    _text(node, "Tarifa", _decimal_to_text(tax.tarifa))
-    _text(node, "Monto", _decimal_to_text(tax.monto))
+        SubElement(node, "CodigoTarifa").text = tax.codigo_tarifa
+    SubElement(node, "Tarifa").text = _decimal_to_text(tax.tarifa)
+    SubElement(node, "Monto").text = _decimal_to_text(tax.monto)
     if tax.factor_iva is not None:
-        _text(node, "FactorIVA", _decimal_to_text(tax.factor_iva))
+        SubElement(node, "FactorIVA").text = _decimal_to_text(tax.factor_iva)
     if tax.exoneracion is not None:
         exo = SubElement(node, "Exoneracion")
-        _text(exo, "TipoDocumento", tax.exoneracion.tipo_documento)
-        _text(exo, "NumeroDocumento", tax.exoneracion.numero_documento)
-        _text(exo, "NombreInstitucion", tax.exoneracion.nombre_institucion)
-        _text(exo, "FechaEmision", _datetime_to_text(tax.exoneracion.fecha_emision))
-        _text(exo, "PorcentajeExoneracion", _decimal_to_text(tax.exoneracion.porcentaje_exoneracion))
-        _text(exo, "MontoExoneracion", _decimal_to_text(tax.exoneracion.monto_exoneracion))
+        SubElement(exo, "TipoDocumento").text = tax.exoneracion.tipo_documento
+        SubElement(exo, "NumeroDocumento").text = tax.exoneracion.numero_documento
+        SubElement(exo, "NombreInstitucion").text = tax.exoneracion.nombre_institucion
+        SubElement(exo, "FechaEmision").text = _datetime_to_text(tax.exoneracion.fecha_emision)
+        SubElement(exo, "PorcentajeExoneracion").text = _decimal_to_text(tax.exoneracion.porcentaje_exoneracion)
+        SubElement(exo, "MontoExoneracion").text = _decimal_to_text(tax.exoneracion.monto_exoneracion)
 
 
 def _append_line(parent: Element, line: InvoiceLine) -> None:
     node = SubElement(parent, "LineaDetalle")
-    _text(node, "NumeroLinea", str(line.numero_linea))
+    SubElement(node, "NumeroLinea").text = str(line.numero_linea)
     if line.codigo:
         codigo = SubElement(node, "Codigo")
-        _text(codigo, "Tipo", "01")
-        _text(codigo, "Codigo", line.codigo)
-    _text(node, "Cantidad", _decimal_to_text(line.cantidad))
-    _text(node, "UnidadMedida", line.unidad_medida)
-    _text(node, "Detalle", line.detalle)
-    _text(node, "PrecioUnitario", _decimal_to_text(line.precio_unitario))
-    _text(node, "MontoTotal", _decimal_to_text(line.monto_total))
+        SubElement(codigo, "Tipo").text = "01"
+        SubElement(codigo, "Codigo").text = line.codigo
+    SubElement(node, "Cantidad").text = _decimal_to_text(line.cantidad)
+    SubElement(node, "UnidadMedida").text = line.unidad_medida
+    SubElement(node, "Detalle").text = line.detalle
+    SubElement(node, "PrecioUnitario").text = _decimal_to_text(line.precio_unitario)
+    SubElement(node, "MontoTotal").text = _decimal_to_text(line.monto_total)
     if line.descuento is not None:
         descuento = SubElement(node, "Descuento")
-        _text(descuento, "MontoDescuento", _decimal_to_text(line.descuento.monto))
-        _text(descuento, "NaturalezaDescuento", line.descuento.naturaleza)
-    _text(node, "SubTotal", _decimal_to_text(line.sub_total))
+        SubElement(descuento, "MontoDescuento").text = _decimal_to_text(line.descuento.monto)
+        SubElement(descuento, "NaturalezaDescuento").text = line.descuento.naturaleza
+    SubElement(node, "SubTotal").text = _decimal_to_text(line.sub_total)
     if line.base_imponible is not None:
-        _text(node, "BaseImponible", _decimal_to_text(line.base_imponible))
+        SubElement(node, "BaseImponible").text = _decimal_to_text(line.base_imponible)
     if line.impuesto is not None:
         _append_tax(node, line.impuesto)
     if line.impuesto_neto is not None:
-        _text(node, "ImpuestoNeto", _decimal_to_text(line.impuesto_neto))
+        SubElement(node, "ImpuestoNeto").text = _decimal_to_text(line.impuesto_neto)
+    monto_total_linea = line.sub_total
     for cargo in line.otros_cargos:
         _append_other_charge(node, "OtroCargo", cargo)
+        monto_total_linea += cargo.monto_cargo
 
-    monto_total_linea = line.sub_total
     if line.impuesto_neto is not None:
         monto_total_linea += line.impuesto_neto
     elif line.impuesto is not None:
         monto_total_linea += line.impuesto.monto
     if line.descuento is not None:
         monto_total_linea -= line.descuento.monto
-    for cargo in line.otros_cargos:
-        monto_total_linea += cargo.monto_cargo
-    _text(node, "MontoTotalLinea", _decimal_to_text(monto_total_linea))
+    SubElement(node, "MontoTotalLinea").text = _decimal_to_text(monto_total_linea)
 
 
 def _append_payment(parent: Element, medios: Iterable[PaymentMethod]) -> None:
@@ -132,14 +195,13 @@ def invoice_to_xml(invoice: ElectronicInvoice, *, validate: bool = True) -> Elem
     if validate:
         validate_invoice(invoice)
 
-    root = Element(
-        "FacturaElectronica",
-        attrib={
-            "xmlns": _NAMESPACE,
-            "xmlns:xsi": "http://www.w3.org/2001/XMLSchema-instance",
-            "xsi:schemaLocation": f"{_NAMESPACE} {_SCHEMA_LOCATION}",
-        },
-    )
+    if _HAS_LXML:
+        # libxml2 declara los espacios de nombres a partir de ``nsmap``; los
+        # hijos sin prefijo se serializan dentro del espacio por defecto.
+        root = Element(_ROOT_TAG, nsmap=_NSMAP)
+        root.set(_SCHEMA_LOCATION_ATTR, _SCHEMA_LOCATION_VALUE)
+    else:  # pragma: no cover - lxml es dependencia declarada
+        root = Element("FacturaElectronica", attrib=_ROOT_ATTRIB)
     _text(root, "Clave", invoice.clave)
     _text(root, "CodigoActividad", invoice.codigo_actividad)
     _text(root, "NumeroConsecutivo", invoice.numero_consecutivo)
@@ -188,6 +250,9 @@ def invoice_to_xml(invoice: ElectronicInvoice, *, validate: bool = True) -> Elem
     _append_payment(root, invoice.sorted_medios_pago())
 
     detalle = SubElement(root, "DetalleServicio")
+    # Las líneas se crean ya dentro de su padre: en lxml un ``Element`` suelto
+    # abre su propio documento y ``extend`` debe moverlo después, lo que
+    # resulta más lento que ``SubElement``.
     for linea in invoice.iter_detalle():
         _append_line(detalle, linea)
 
@@ -247,7 +312,266 @@ def invoice_to_xml(invoice: ElectronicInvoice, *, validate: bool = True) -> Elem
     return root
 
 
-def render_invoice(invoice: ElectronicInvoice, *, validate: bool = True, encoding: str = "utf-8", xml_declaration: bool = True) -> str:
+@lru_cache(maxsize=4096)
+def _escape(value: str) -> str:
+    if _INVALID_XML_CHARS.search(value):
+        raise ValueError(_INVALID_XML_MESSAGE)
+    return escape(value, _TEXT_ENTITIES)
+
+
+def _open(out: List[str], tag: str) -> None:
+    out.append(f"<{tag}>")
+
+
+def _close(out: List[str], tag: str) -> None:
+    out.append(f"</{tag}>")
+
+
+def _leaf(out: List[str], tag: str, value: str | None) -> None:
+    if value is None:
+        # Igual que un ``text`` nulo en el árbol: elemento vacío autocerrado.
+        out.append(f"<{tag}/>")
+        return
+    out.append(f"<{tag}>{_escape(value)}</{tag}>")
+
+
+def _stream_phone(out: List[str], tag: str, phone) -> None:
+    _open(out, tag)
+    _leaf(out, "CodigoPais", phone.codigo_pais)
+    _leaf(out, "NumTelefono", phone.numero)
+    _close(out, tag)
+
+
+def _stream_location(out: List[str], location) -> None:
+    _open(out, "Ubicacion")
+    _leaf(out, "Provincia", location.provincia)
+    _leaf(out, "Canton", location.canton)
+    _leaf(out, "Distrito", location.distrito)
+    if location.barrio:
+        _leaf(out, "Barrio", location.barrio)
+    if location.otras_senas:
+        _leaf(out, "OtrasSenas", location.otras_senas)
+    _close(out, "Ubicacion")
+
+
+def _stream_other_charge(out: List[str], tag: str, cargo: OtherCharge) -> None:
+    _open(out, tag)
+    _leaf(out, "TipoDocumento", cargo.tipo_documento)
+    _leaf(out, "NumeroDocumento", cargo.numero_documento)
+    _leaf(out, "NombreInstitucion", cargo.nombre_institucion)
+    _leaf(out, "FechaEmision", _datetime_to_text(cargo.fecha_emision))
+    _leaf(out, "MontoCargo", _decimal_to_text(cargo.monto_cargo, places=5))
+    _close(out, tag)
+
+
+def _stream_tax(out: List[str], tax: Tax) -> None:
+    _open(out, "Impuesto")
+    _leaf(out, "Codigo", tax.codigo)
+    if tax.codigo_tarifa:
+        _leaf(out, "CodigoTarifa", tax.codigo_tarifa)
+    _leaf(out, "Tarifa", _decimal_to_text(tax.tarifa))
+    _leaf(out, "Monto", _decimal_to_text(tax.monto))
+    if tax.factor_iva is not None:
+        _leaf(out, "FactorIVA", _decimal_to_text(tax.factor_iva))
+    if tax.exoneracion is not None:
+        _open(out, "Exoneracion")
+        _leaf(out, "TipoDocumento", tax.exoneracion.tipo_documento)
+        _leaf(out, "NumeroDocumento", tax.exoneracion.numero_documento)
+        _leaf(out, "NombreInstitucion", tax.exoneracion.nombre_institucion)
+        _leaf(out, "FechaEmision", _datetime_to_text(tax.exoneracion.fecha_emision))
+        _leaf(out, "PorcentajeExoneracion", _decimal_to_text(tax.exoneracion.porcentaje_exoneracion))
+        _leaf(out, "MontoExoneracion", _decimal_to_text(tax.exoneracion.monto_exoneracion))
+        _close(out, "Exoneracion")
+    _close(out, "Impuesto")
+
+
+def _stream_line(out: List[str], line: InvoiceLine) -> None:
+    _open(out, "LineaDetalle")
+    _leaf(out, "NumeroLinea", str(line.numero_linea))
+    if line.codigo:
+        _open(out, "Codigo")
+        _leaf(out, "Tipo", "01")
+        _leaf(out, "Codigo", line.codigo)
+        _close(out, "Codigo")
+    _leaf(out, "Cantidad", _decimal_to_text(line.cantidad))
+    _leaf(out, "UnidadMedida", line.unidad_medida)
+    _leaf(out, "Detalle", line.detalle)
+    _leaf(out, "PrecioUnitario", _decimal_to_text(line.precio_unitario))
+    _leaf(out, "MontoTotal", _decimal_to_text(line.monto_total))
+    if line.descuento is not None:
+        _open(out, "Descuento")
+        _leaf(out, "MontoDescuento", _decimal_to_text(line.descuento.monto))
+        _leaf(out, "NaturalezaDescuento", line.descuento.naturaleza)
+        _close(out, "Descuento")
+    _leaf(out, "SubTotal", _decimal_to_text(line.sub_total))
+    if line.base_imponible is not None:
+        _leaf(out, "BaseImponible", _decimal_to_text(line.base_imponible))
+    if line.impuesto is not None:
+        _stream_tax(out, line.impuesto)
+    if line.impuesto_neto is not None:
+        _leaf(out, "ImpuestoNeto", _decimal_to_text(line.impuesto_neto))
+    monto_total_linea = line.sub_total
+    for cargo in line.otros_cargos:
+        _stream_other_charge(out, "OtroCargo", cargo)
+        monto_total_linea += cargo.monto_cargo
+
+    if line.impuesto_neto is not None:
+        monto_total_linea += line.impuesto_neto
+    elif line.impuesto is not None:
+        monto_total_linea += line.impuesto.monto
+    if line.descuento is not None:
+        monto_total_linea -= line.descuento.monto
+    _leaf(out, "MontoTotalLinea", _decimal_to_text(monto_total_linea))
+    _close(out, "LineaDetalle")
+
+
+def _stream_party(out: List[str], tag: str, party, *, extranjero: bool) -> None:
+    _open(out, tag)
+    _leaf(out, "Nombre", party.nombre)
+    if party.identificacion:
+        _open(out, "Identificacion")
+        _leaf(out, "Tipo", party.identificacion.tipo)
+        _leaf(out, "Numero", party.identificacion.numero)
+        _close(out, "Identificacion")
+    if extranjero and party.identificacion_extranjero:
+        _leaf(out, "IdentificacionExtranjero", party.identificacion_extranjero)
+    if party.nombre_comercial:
+        _leaf(out, "NombreComercial", party.nombre_comercial)
+    if party.ubicacion:
+        _stream_location(out, party.ubicacion)
+    if party.telefono:
+        _stream_phone(out, "Telefono", party.telefono)
+    if party.fax:
+        _stream_phone(out, "Fax", party.fax)
+    if party.correo_electronico:
+        _leaf(out, "CorreoElectronico", party.correo_electronico)
+    _close(out, tag)
+
+
+def stream_invoice(invoice: ElectronicInvoice, out: bytearray, *, validate: bool = True) -> None:
+    """Escribe el documento UTF-8 del comprobante al final de ``out``.
+
+    Produce los mismos bytes que :func:`render_invoice_bytes` sin construir
+    el árbol de elementos: los textos ``None`` quedan como elementos vacíos y
+    los caracteres fuera de XML 1.0 se rechazan con ``ValueError``. Pensado
+    para generación masiva; quien necesite manipular el DOM debe seguir
+    usando :func:`invoice_to_xml`.
+    """
+
+    if validate:
+        validate_invoice(invoice)
+
+    parts: List[str] = [_STREAM_PROLOG]
+    _leaf(parts, "Clave", invoice.clave)
+    _leaf(parts, "CodigoActividad", invoice.codigo_actividad)
+    _leaf(parts, "NumeroConsecutivo", invoice.numero_consecutivo)
+    _leaf(parts, "FechaEmision", _datetime_to_text(invoice.fecha_emision))
+
+    _stream_party(parts, "Emisor", invoice.emisor, extranjero=False)
+    if invoice.receptor is not None:
+        _stream_party(parts, "Receptor", invoice.receptor, extranjero=True)
+
+    _leaf(parts, "CondicionVenta", invoice.condicion_venta.value)
+    if invoice.plazo_credito:
+        _leaf(parts, "PlazoCredito", invoice.plazo_credito)
+    for medio in invoice.sorted_medios_pago():
+        _leaf(parts, "MedioPago", medio.value)
+
+    _open(parts, "DetalleServicio")
+    for linea in invoice.iter_detalle():
+        _stream_line(parts, linea)
+    _close(parts, "DetalleServicio")
+
+    resumen = invoice.resumen
+    _open(parts, "ResumenFactura")
+    _open(parts, "CodigoTipoMoneda")
+    _leaf(parts, "CodigoMoneda", resumen.moneda)
+    if resumen.tipo_cambio is not None:
+        _leaf(parts, "TipoCambio", _decimal_to_text(resumen.tipo_cambio, places=5))
+    _close(parts, "CodigoTipoMoneda")
+    for tag, value in (
+        ("TotalServGravados", resumen.total_serv_gravados),
+        ("TotalServExentos", resumen.total_serv_exentos),
+        ("TotalServExonerado", resumen.total_serv_exonerado),
+        ("TotalServNoSujeto", resumen.total_serv_no_sujeto),
+        ("TotalServOtros", resumen.total_serv_otros),
+        ("TotalMercanciasGravadas", resumen.total_mercancias_gravadas),
+        ("TotalMercanciasExentas", resumen.total_mercancias_exentas),
+        ("TotalMercanciasExoneradas", resumen.total_mercancias_exoneradas),
+        ("TotalMercanciasNoSujeto", resumen.total_mercancias_no_sujeto),
+        ("TotalMercanciasOtros", resumen.total_mercancias_otros),
+        ("TotalGravado", resumen.total_gravado),
+        ("TotalExento", resumen.total_exento),
+        ("TotalExonerado", resumen.total_exonerado),
+        ("TotalNoSujeto", resumen.total_no_sujeto),
+        ("TotalOtros", resumen.total_otros),
+        ("TotalVenta", resumen.total_venta),
+        ("TotalDescuentos", resumen.total_descuentos),
+        ("TotalVentaNeta", resumen.total_venta_neta),
+        ("TotalImpuesto", resumen.total_impuestos),
+        ("TotalIVADevuelto", resumen.total_iva_devuelto),
+        ("TotalOtrosCargos", resumen.total_otros_cargos),
+        ("TotalComprobante", resumen.total_comprobante),
+    ):
+        _leaf(parts, tag, _decimal_to_text(value))
+    _close(parts, "ResumenFactura")
+
+    if invoice.otros_cargos:
+        _open(parts, "OtrosCargos")
+        for cargo in invoice.otros_cargos:
+            _stream_other_charge(parts, "OtroCargo", cargo)
+        _close(parts, "OtrosCargos")
+
+    if invoice.informacion_referencia:
+        _open(parts, "InformacionReferencia")
+        for ref in invoice.informacion_referencia:
+            _open(parts, "Referencia")
+            _leaf(parts, "TipoDocumento", ref.tipo_documento)
+            _leaf(parts, "Numero", ref.numero_documento)
+            _leaf(parts, "FechaEmision", _datetime_to_text(ref.fecha_emision))
+            _leaf(parts, "Codigo", ref.codigo)
+            _leaf(parts, "Razon", ref.razon)
+            _close(parts, "Referencia")
+        _close(parts, "InformacionReferencia")
+
+    _close(parts, "FacturaElectronica")
+    out += "".join(parts).encode("utf-8")
+
+
+def render_invoice_bytes(invoice: ElectronicInvoice, *, validate: bool = True, encoding: str = "utf-8", xml_declaration: bool = True) -> bytes:
+    """Serializa el comprobante directamente a ``bytes`` listos para firmar o almacenar."""
+
     element = invoice_to_xml(invoice, validate=validate)
-    xml_bytes = tostring(element, encoding=encoding, xml_declaration=xml_declaration)
+    return tostring(element, encoding=encoding, xml_declaration=xml_declaration)
+
+
+def render_invoice(invoice: ElectronicInvoice, *, validate: bool = True, encoding: str = "utf-8", xml_declaration: bool = True) -> str:
+    xml_bytes = render_invoice_bytes(invoice, validate=validate, encoding=encoding, xml_declaration=xml_declaration)
     return xml_bytes.decode(encoding)
+
+
+def render_invoices_bytes(
+    invoices: Sequence[ElectronicInvoice],
+    *,
+    validate: bool = True,
+    max_workers: int | None = None,
+) -> List[bytes]:
+    """Serializa varios comprobantes conservando el orden recibido.
+
+    Con ``max_workers`` mayor que 1 y lotes grandes, el render se reparte entre
+    procesos iniciados con ``spawn`` (no heredan conexiones ni hilos del
+    proceso padre). En cualquier otro caso se procesa secuencialmente.
+    """
+
+    if not max_workers or max_workers < 2 or len(invoices) < _PARALLEL_RENDER_THRESHOLD:
+        return [render_invoice_bytes(invoice, validate=validate) for invoice in invoices]
+
+    # Importación diferida: ``import fe_cr`` no debe cargar ``multiprocessing``
+    # para una ruta opcional.
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    render = partial(render_invoice_bytes, validate=validate)
+    chunksize = max(1, len(invoices) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(render, invoices, chunksize=chunksize))
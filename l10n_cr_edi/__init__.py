@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import importlib.util
 import os
 import sys
 
@@ -17,14 +18,22 @@ def _ensure_fe_cr_on_path() -> None:
     default.  Adding the shared repository root to ``sys.path`` makes the
     package available without requiring a separate pip installation, avoiding
     spurious external dependency errors during module installation.
+
+    When ``fe_cr`` is already installed (``pip install -e .``) ``sys.path`` is
+    left untouched.  Otherwise the repository root is appended rather than
+    prepended, so every other import in the server still resolves before
+    reaching it.
     """
 
+    if importlib.util.find_spec("fe_cr") is not None:
+        return
+
     module_dir = os.path.dirname(__file__)
     addons_root = os.path.normpath(os.path.join(module_dir, os.pardir))
     package_dir = os.path.join(addons_root, "fe_cr")
 
     if os.path.isdir(package_dir) and addons_root not in sys.path:
-        sys.path.insert(0, addons_root)
+        sys.path.append(addons_root)
 
 
 _ensure_fe_cr_on_path()
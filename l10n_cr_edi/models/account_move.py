@@ -1,8 +1,12 @@
 from __future__ import annotations
 
 import base64
-import json
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
 from decimal import Decimal
+from functools import lru_cache
+from typing import Any, NamedTuple
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
@@ -26,7 +30,85 @@ from fe_cr import (
     sign_xml_with_p12,
     validate_invoice,
 )
-from fe_cr.xml_builder import render_invoice
+from fe_cr._compat import json_dumps
+from fe_cr.xml_builder import RENDER_REVISION, render_invoice_bytes, render_invoices_bytes
+
+_SUMMARY_GROUPS = ("gravado", "exento", "exonerado", "no_sujeto", "otros")
+_ZERO_AMOUNT = Decimal("0.00")
+_ZERO = Decimal("0")
+_REUSABLE_DOCUMENT_STATES = ("draft", "generated", "error")
+_HUNDRED = Decimal("100")
+
+
+# ``typed``: ``1`` y ``1.0`` son iguales para la caché, pero no para ``str``.
+@lru_cache(maxsize=4096, typed=True)
+def _cached_decimal(value: float | int) -> Decimal:
+    return Decimal(str(value))
+
+
+def _to_decimal(value) -> Decimal:
+    """Convierte un monto del ORM a ``Decimal`` conservando su representación.
+
+    Cantidades, precios y tasas se repiten mucho entre líneas, así que la
+    conversión vía ``str`` se memoriza. ``-0.0`` y ``False`` se tratan como 0.
+    """
+    return _cached_decimal(value or 0)
+
+
+_PAYMENT_CODES = {method.value: method for method in PaymentMethod}
+
+
+@lru_cache(maxsize=64)
+def _parse_payment_methods_cached(raw: str) -> tuple[PaymentMethod, ...]:
+    # Los códigos desconocidos se omiten; uno vacío equivale a efectivo.
+    methods = tuple(
+        _PAYMENT_CODES[code]
+        for code in (part.strip() or "01" for part in raw.split(","))
+        if code in _PAYMENT_CODES
+    )
+    return methods or (PaymentMethod.EFECTIVO,)
+
+
+@lru_cache(maxsize=8)
+def _decode_certificate(certificate_b64: bytes) -> bytes:
+    # ``fe_cr.signing`` ya conserva el PKCS#12 descifrado; aquí se evita
+    # decodificar el mismo adjunto en cada factura del lote.
+    return base64.b64decode(certificate_b64)
+
+
+def _cr_payload_fingerprint(invoice, *, validated: bool) -> str:
+    """Huella del payload: ``repr`` de los dataclasses es determinista y
+    bastante más barato que renderizar y validar de nuevo el XML.
+
+    Incluye si el comprobante se validó y la revisión del renderer. La
+    naturaleza de los descuentos se traduce al idioma del usuario y no
+    entra en la huella.
+    """
+    lines = tuple(
+        line if line.descuento is None else replace(line, descuento=line.descuento.monto)
+        for line in invoice.detalle_servicio
+    )
+    payload = (RENDER_REVISION, validated, replace(invoice, detalle_servicio=lines))
+    return hashlib.blake2b(repr(payload).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class _CrSubmission(NamedTuple):
+    """Comprobante firmado listo para enviarse a Hacienda."""
+
+    move: Any
+    document: Any
+    api: HaciendaAPI
+    invoice: ElectronicInvoice
+    signed_xml: bytes
+    signed_xml_b64: bytes
+
+
+def _submit_cr_invoice(submission: _CrSubmission):
+    """Envía un comprobante firmado; devuelve ``(respuesta, error)``."""
+    try:
+        return submission.api.submit_invoice(submission.invoice, xml=submission.signed_xml), None
+    except Exception as exc:  # se registra en el hilo principal
+        return None, exc
 
 
 class AccountMove(models.Model):
@@ -84,37 +166,74 @@ class AccountMove(models.Model):
             move.show_cr_xml_actions = move.move_type in ("out_invoice", "out_refund")
 
     def action_generate_cr_xml(self):
+        Document = self.env["fe.cr.document"]
+        self._prefetch_cr_payload_data()
+        self.with_context(prefetch_fields=False)._ensure_cr_setup()
+        invoices = []
+        validated = []
         for move in self:
-            move._ensure_cr_configuration()
             invoice = move._prepare_cr_invoice_payload()
-            try:
-                validate_invoice(invoice)
-            except ValidationError as exc:
-                raise UserError(_("La factura no cumple con los anexos 4.4: %s") % exc) from exc
+            validated.append(move._validate_cr_invoice(invoice))
+            invoices.append(invoice)
+
+        # El render no usa el ORM: con ``cr_render_workers`` en el contexto los
+        # lotes grandes se serializan en procesos aparte.
+        xml_documents = render_invoices_bytes(
+            invoices,
+            validate=False,
+            max_workers=self.env.context.get("cr_render_workers"),
+        )
 
-            xml_bytes = render_invoice(invoice).encode("utf-8")
+        pending_documents = []
+        reusable_documents = self._get_cr_reusable_documents()
+        for move, invoice, is_validated, xml_bytes in zip(self, invoices, validated, xml_documents):
             filename = f"{move.name or 'factura'}_{move.id}.xml"
-            document = move._ensure_cr_document(xml_bytes, filename)
-            document.state = "generated"
-            document.message = False
-            move.cr_electronic_state = "generated"
+            fingerprint = _cr_payload_fingerprint(invoice, validated=is_validated)
+            document = reusable_documents.get(move.id)
+            if document:
+                document.write(
+                    {
+                        "state": "generated",
+                        "message": False,
+                        "xml_comprobante": base64.b64encode(xml_bytes),
+                        "xml_filename": filename,
+                        "fingerprint": fingerprint,
+                    }
+                )
+            else:
+                pending_documents.append((move, xml_bytes, filename, fingerprint))
+        # Un único INSERT para los documentos nuevos y un único UPDATE de estado.
+        if pending_documents:
+            Document.create_from_invoices(pending_documents)
+        self.write({"cr_electronic_state": "generated"})
         return True
 
     def action_send_cr_xml(self):
+        self._prefetch_cr_payload_data()
+        self.with_context(prefetch_fields=False)._ensure_cr_setup(require_credentials=True)
+        # Un cliente autenticado por compañía: el token y la sesión HTTP se
+        # reutilizan para todas las facturas del lote.
+        apis = {}
+        submissions = []
+        Document = self.env["fe.cr.document"]
+        reusable_documents = self._get_cr_reusable_documents()
         for move in self:
-            move._ensure_cr_configuration()
             company = move.company_id
-            move._ensure_cr_credentials()
-
             invoice = move._prepare_cr_invoice_payload()
-            try:
-                validate_invoice(invoice)
-            except ValidationError as exc:
-                raise UserError(_("La factura no cumple con los anexos 4.4: %s") % exc) from exc
-
-            unsigned_xml = render_invoice(invoice).encode("utf-8")
-            filename = f"{move.name or 'factura'}_{move.id}.xml"
-            document = move._ensure_cr_document(unsigned_xml, filename)
+            document = reusable_documents.get(move.id, Document)
+            if (
+                document.state == "generated"
+                and document.xml_comprobante
+                and document.fingerprint == _cr_payload_fingerprint(invoice, validated=True)
+            ):
+                # La factura no cambió desde "Generar XML", ese XML se validó y
+                # lo produjo el renderer actual: se firma tal cual.
+                unsigned_xml = base64.b64decode(document.xml_comprobante)
+            else:
+                move._validate_cr_invoice(invoice)
+                unsigned_xml = render_invoice_bytes(invoice, validate=False)
+                filename = f"{move.name or 'factura'}_{move.id}.xml"
+                document = move._ensure_cr_document(unsigned_xml, filename, document=document)
 
             try:
                 signed_xml = move._sign_cr_xml(unsigned_xml)
@@ -127,60 +246,198 @@ class AccountMove(models.Model):
                 )
                 move.cr_electronic_state = "error"
                 raise UserError(_("No se pudo firmar el XML: %s") % exc) from exc
+            # Se codifica una vez; lo reutilizan tanto el éxito como los errores.
+            signed_xml_b64 = base64.b64encode(signed_xml)
 
-            api = HaciendaAPI(environment=company.cr_environment or "sandbox")
             try:
-                api.authenticate(company.cr_hacienda_username, company.cr_hacienda_password)
-                response = api.submit_invoice(invoice, xml=signed_xml)
-            except HaciendaAPIError as exc:
-                payload = exc.payload or {}
-                message = json.dumps(payload, ensure_ascii=False, indent=2) if isinstance(payload, dict) else str(exc)
-                document.write(
-                    {
-                        "state": "error",
-                        "message": message,
-                        "xml_comprobante": base64.b64encode(signed_xml),
-                    }
-                )
-                move.cr_electronic_state = "error"
-                raise UserError(_("Hacienda rechazó el comprobante: %s") % exc) from exc
+                api = apis.get(company.id)
+                if api is None:
+                    api = HaciendaAPI(environment=company.cr_environment or "sandbox")
+                    api.authenticate(company.cr_hacienda_username, company.cr_hacienda_password)
+                    apis[company.id] = api
             except Exception as exc:
-                document.write(
-                    {
-                        "state": "error",
-                        "message": str(exc),
-                        "xml_comprobante": base64.b64encode(signed_xml),
-                    }
-                )
-                move.cr_electronic_state = "error"
-                raise UserError(_("Ocurrió un error al enviar a Hacienda: %s") % exc) from exc
-
-            document.write(
+                # Aún no se envió nada: abortar no deja comprobantes huérfanos.
+                raise UserError(move._cr_submission_failed(document, signed_xml_b64, exc)) from exc
+            submissions.append(_CrSubmission(move, document, api, invoice, signed_xml, signed_xml_b64))
+
+        # Los envíos sólo usan el cliente HTTP, nunca el ORM: con
+        # ``cr_submit_max_workers`` en el contexto se hacen en paralelo.
+        max_workers = self.env.context.get("cr_submit_max_workers")
+        if max_workers and max_workers > 1 and len(submissions) > 1:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(_submit_cr_invoice, submissions))
+        else:
+            # En serie, tras el primer fallo no se envía nada más.
+            results = []
+            for submission in submissions:
+                results.append(_submit_cr_invoice(submission))
+                if results[-1][1] is not None:
+                    break
+
+        # Hacienda ya recibió los comprobantes aceptados: se registran antes
+        # que los fallos y no se aborta la transacción, para que un reintento
+        # no vuelva a enviar esas claves.
+        sent_documents = Document
+        sent_moves = self.browse()
+        failures = []
+        for submission, (response, error) in zip(submissions, results):
+            if error is not None:
+                failures.append((submission, error))
+                continue
+            submission.document.write(
                 {
-                    "state": "sent",
-                    "xml_comprobante": base64.b64encode(signed_xml),
-                    "sent_date": fields.Datetime.now(),
-                    "message": json.dumps(response, ensure_ascii=False, indent=2),
+                    "xml_comprobante": submission.signed_xml_b64,
+                    "message": json_dumps(response).decode("utf-8"),
                 }
             )
-            move.cr_electronic_state = "sent"
-        return True
-
-    def _ensure_cr_configuration(self):
-        for move in self:
-            company = move.company_id
-            missing = []
-            required_fields = {
-                "cr_identification_type": _("Tipo de identificación"),
-                "cr_identification_number": _("Número de identificación"),
-                "cr_province": _("Provincia"),
-                "cr_canton": _("Cantón"),
-                "cr_district": _("Distrito"),
-                "cr_address": _("Dirección"),
+            sent_documents |= submission.document
+            sent_moves |= submission.move
+        # Los valores comunes se escriben con un único UPDATE por modelo.
+        sent_documents.write({"state": "sent", "sent_date": fields.Datetime.now()})
+        sent_moves.write({"cr_electronic_state": "sent"})
+        if not failures:
+            return True
+
+        messages = [
+            "%s: %s" % (
+                submission.move.display_name,
+                submission.move._cr_submission_failed(submission.document, submission.signed_xml_b64, error),
+            )
+            for submission, error in failures
+        ]
+        pending = len(submissions) - len(results)
+        if pending:
+            messages.append(_("%s factura(s) no se enviaron; puede reintentarlas.") % pending)
+        return {
+            "type": "ir.actions.client",
+            "tag": "display_notification",
+            "params": {
+                "title": _("Algunos comprobantes no se enviaron a Hacienda"),
+                "message": "\n".join(messages),
+                "type": "danger",
+                "sticky": True,
+            },
+        }
+
+    def _cr_submission_failed(self, document, signed_xml_b64, exc):
+        """Registra el fallo de envío en el documento y devuelve el mensaje para el usuario."""
+        if isinstance(exc, HaciendaAPIError):
+            payload = exc.payload or {}
+            message = json_dumps(payload).decode("utf-8") if isinstance(payload, dict) else str(exc)
+            user_message = _("Hacienda rechazó el comprobante: %s") % exc
+        else:
+            message = str(exc)
+            user_message = _("Ocurrió un error al enviar a Hacienda: %s") % exc
+        document.write(
+            {
+                "state": "error",
+                "message": message,
+                "xml_comprobante": signed_xml_b64,
             }
-            for field_name, label in required_fields.items():
-                if not company[field_name]:
-                    missing.append(label)
+        )
+        self.cr_electronic_state = "error"
+        return user_message
+
+    def _prefetch_cr_payload_data(self):
+        """Carga en caché, para todo el lote, los datos que usa el payload.
+
+        Se hace una consulta por modelo en lugar de una por factura cuando
+        ``_prepare_cr_invoice_payload`` recorre cada movimiento.
+        """
+        self.fetch(
+            [
+                "name",
+                "company_id",
+                "partner_id",
+                "currency_id",
+                "invoice_date",
+                "invoice_line_ids",
+                "cr_invoice_key",
+                "cr_consecutive_number",
+                "cr_activity_code",
+                "cr_sale_condition",
+                "cr_credit_days",
+                "cr_payment_methods",
+            ]
+        )
+        lines = self.invoice_line_ids.filtered(lambda l: l.display_type not in ("line_section", "line_note"))
+        lines.fetch(
+            [
+                "quantity",
+                "price_unit",
+                "price_subtotal",
+                "price_total",
+                "discount",
+                "name",
+                "tax_ids",
+                "product_id",
+                "product_uom_id",
+            ]
+        )
+        lines.product_id.fetch(["default_code", "type"])
+        lines.product_uom_id.fetch(["l10n_cr_code", "name"])
+        lines.tax_ids.fetch(["amount", "l10n_cr_tax_code", "l10n_cr_summary_group"])
+        self.company_id.fetch(
+            [
+                "name",
+                "currency_id",
+                "cr_identification_type",
+                "cr_identification_number",
+                "cr_commercial_name",
+                "cr_activity_code",
+                "cr_phone_country_code",
+                "cr_phone_number",
+                "cr_email",
+                "cr_province",
+                "cr_canton",
+                "cr_district",
+                "cr_neighborhood",
+                "cr_address",
+            ]
+        )
+        self.partner_id.commercial_partner_id.fetch(
+            [
+                "name",
+                "email",
+                "vat",
+                "ref",
+                "street",
+                "is_company",
+                "l10n_cr_identification_type",
+                "l10n_cr_identification_number",
+                "l10n_cr_phone_country_code",
+                "l10n_cr_phone_number",
+                "l10n_cr_province",
+                "l10n_cr_canton",
+                "l10n_cr_district",
+                "l10n_cr_neighborhood",
+                "l10n_cr_address",
+            ]
+        )
+
+    def _ensure_cr_setup(self, require_credentials=False):
+        """Verifica la configuración de Hacienda de todo el lote.
+
+        Cada compañía y cada cliente comercial se revisan una sola vez, aunque
+        aparezcan en varias facturas. Con ``require_credentials`` también se
+        exigen los credenciales de envío y firma.
+        """
+        required_fields = {
+            "cr_identification_type": _("Tipo de identificación"),
+            "cr_identification_number": _("Número de identificación"),
+            "cr_province": _("Provincia"),
+            "cr_canton": _("Cantón"),
+            "cr_district": _("Distrito"),
+            "cr_address": _("Dirección"),
+        }
+        credential_fields = {
+            "cr_hacienda_username": _("Usuario Hacienda"),
+            "cr_hacienda_password": _("Contraseña Hacienda"),
+            "cr_certificate_p12": _("Certificado P12 Hacienda"),
+            "cr_certificate_password": _("Contraseña certificado"),
+        }
+        for company in self.company_id:
+            missing = [label for field_name, label in required_fields.items() if not company[field_name]]
             if missing:
                 raise UserError(
                     _(
@@ -188,25 +445,30 @@ class AccountMove(models.Model):
                     )
                     % (company.name, ", ".join(missing))
                 )
-            if not move.partner_id:
-                raise UserError(_("La factura debe tener un cliente asignado."))
-            partner = move.partner_id.commercial_partner_id
+            if require_credentials:
+                missing = [label for field_name, label in credential_fields.items() if not company[field_name]]
+                if missing:
+                    raise UserError(
+                        _(
+                            "La compañía %s no tiene configurados los credenciales requeridos: %s"
+                        )
+                        % (company.name, ", ".join(missing))
+                    )
+
+        if self.filtered(lambda m: not m.partner_id):
+            raise UserError(_("La factura debe tener un cliente asignado."))
+        for partner in self.partner_id.commercial_partner_id:
             partner_missing = []
             if not partner.l10n_cr_identification_type:
                 partner_missing.append(_("Tipo identificación cliente"))
-            if partner.l10n_cr_identification_type == "05":
-                if not (
-                    partner.l10n_cr_identification_number
-                    or partner.vat
-                    or partner.ref
-                ):
+            if not (
+                partner.l10n_cr_identification_number
+                or partner.vat
+                or partner.ref
+            ):
+                if partner.l10n_cr_identification_type == "05":
                     partner_missing.append(_("Documento extranjero"))
-            else:
-                if not (
-                    partner.l10n_cr_identification_number
-                    or partner.vat
-                    or partner.ref
-                ):
+                else:
                     partner_missing.append(_("Número identificación cliente"))
             if partner_missing:
                 raise UserError(
@@ -219,6 +481,9 @@ class AccountMove(models.Model):
 
     def _prepare_cr_invoice_payload(self) -> ElectronicInvoice:
         self.ensure_one()
+        # Los campos necesarios ya se cargaron en ``_prefetch_cr_payload_data``;
+        # un acceso no previsto lee sólo esa columna y no el registro completo.
+        self = self.with_context(prefetch_fields=False)
         company = self.company_id
         partner = self.partner_id.commercial_partner_id
 
@@ -292,90 +557,79 @@ class AccountMove(models.Model):
         )
 
         detalle = []
-        total_serv_gravados = Decimal("0")
-        total_serv_exentos = Decimal("0")
-        total_serv_exonerado = Decimal("0")
-        total_serv_no_sujeto = Decimal("0")
-        total_serv_otros = Decimal("0")
-        total_mercancias_gravadas = Decimal("0")
-        total_mercancias_exentas = Decimal("0")
-        total_mercancias_exoneradas = Decimal("0")
-        total_mercancias_no_sujeto = Decimal("0")
-        total_mercancias_otros = Decimal("0")
-        total_descuentos = Decimal("0")
-        for index, line in enumerate(
-            self.invoice_line_ids.filtered(lambda l: l.display_type not in ("line_section", "line_note")),
-            start=1,
-        ):
+        # Subtotales por (es_servicio, grupo de resumen), acumulados en la
+        # misma pasada que construye las líneas.
+        group_subtotals = dict.fromkeys(
+            ((is_service, group) for is_service in (True, False) for group in _SUMMARY_GROUPS),
+            _ZERO,
+        )
+        total_descuentos = _ZERO
+        lines = self.invoice_line_ids.filtered(lambda l: l.display_type not in ("line_section", "line_note"))
+        # Los productos e impuestos suelen repetirse entre líneas: los códigos
+        # de catálogo se resuelven una vez por registro.
+        uom_code_cache: dict[int, str] = {}
+        tax_data_cache: dict[int, tuple[str, Decimal, str | bool]] = {}
+        for index, line in enumerate(lines, start=1):
+            quantity = _to_decimal(line.quantity)
+            price_unit = _to_decimal(line.price_unit)
+            line_subtotal = _to_decimal(line.price_subtotal)
+            line_total_amount = price_unit * quantity
+
             tax = None
-            tax_amount = Decimal("0.00")
+            tax_amount = _ZERO_AMOUNT
             tax_record = line.tax_ids[:1]
             summary_group = "exento"
             if tax_record:
-                tax_rec = tax_record[0]
-                tax_code = getattr(tax_rec, "l10n_cr_tax_code", None) or "01"
-                tax_amount = Decimal(str(line.price_total - line.price_subtotal))
+                tax_data = tax_data_cache.get(tax_record.id)
+                if tax_data is None:
+                    tax_data = tax_data_cache[tax_record.id] = (
+                        getattr(tax_record, "l10n_cr_tax_code", None) or "01",
+                        _to_decimal(tax_record.amount),
+                        getattr(tax_record, "l10n_cr_summary_group", False),
+                    )
+                tax_code, tax_rate, tax_group = tax_data
+                tax_amount = _to_decimal(line.price_total - line.price_subtotal)
                 tax = Tax(
                     codigo=tax_code,
-                    tarifa=Decimal(str(tax_rec.amount)),
+                    tarifa=tax_rate,
                     monto=tax_amount,
                 )
-                summary_group = getattr(tax_rec, "l10n_cr_summary_group", False) or (
-                    "gravado" if tax_amount != Decimal("0.00") else "exento"
+                summary_group = tax_group or (
+                    "gravado" if tax_amount != _ZERO_AMOUNT else "exento"
                 )
             elif line.price_total != line.price_subtotal:
-                tax_amount = Decimal(str(line.price_total - line.price_subtotal))
+                tax_amount = _to_decimal(line.price_total - line.price_subtotal)
                 summary_group = "gravado"
 
-            if summary_group not in {"gravado", "exento", "exonerado", "no_sujeto", "otros"}:
-                summary_group = "exento" if tax_amount == Decimal("0.00") else "gravado"
+            if summary_group not in _SUMMARY_GROUPS:
+                summary_group = "exento" if tax_amount == _ZERO_AMOUNT else "gravado"
 
             discount = None
-            discount_amount = Decimal("0.00")
+            discount_amount = _ZERO_AMOUNT
             if line.discount:
-                line_total = Decimal(str(line.price_unit)) * Decimal(str(line.quantity))
-                discount_amount = line_total * Decimal(str(line.discount / 100.0))
+                discount_amount = line_total_amount * _to_decimal(line.discount) / _HUNDRED
                 discount = Discount(
                     monto=discount_amount,
                     naturaleza=_("Descuento de línea"),
                 )
                 total_descuentos += discount_amount
 
-            line_subtotal = Decimal(str(line.price_subtotal or 0))
-            line_total_amount = Decimal(str(line.price_unit or 0)) * Decimal(str(line.quantity or 0))
+            uom = line.product_uom_id
+            unidad_medida = uom_code_cache.get(uom.id)
+            if unidad_medida is None:
+                unidad_medida = uom_code_cache[uom.id] = uom.l10n_cr_code or uom.name or "Unid"
+
             product_type = line.product_id.type or "service"
-            is_service = product_type == "service"
-            if is_service:
-                if summary_group == "gravado":
-                    total_serv_gravados += line_subtotal
-                elif summary_group == "exento":
-                    total_serv_exentos += line_subtotal
-                elif summary_group == "exonerado":
-                    total_serv_exonerado += line_subtotal
-                elif summary_group == "no_sujeto":
-                    total_serv_no_sujeto += line_subtotal
-                else:
-                    total_serv_otros += line_subtotal
-            else:
-                if summary_group == "gravado":
-                    total_mercancias_gravadas += line_subtotal
-                elif summary_group == "exento":
-                    total_mercancias_exentas += line_subtotal
-                elif summary_group == "exonerado":
-                    total_mercancias_exoneradas += line_subtotal
-                elif summary_group == "no_sujeto":
-                    total_mercancias_no_sujeto += line_subtotal
-                else:
-                    total_mercancias_otros += line_subtotal
+            group_subtotals[product_type == "service", summary_group] += line_subtotal
 
             detalle.append(
                 InvoiceLine(
                     numero_linea=index,
                     codigo=line.product_id.default_code,
-                    cantidad=Decimal(str(line.quantity or 0)),
-                    unidad_medida=line.product_uom_id.l10n_cr_code or line.product_uom_id.name or "Unid",
+                    cantidad=quantity,
+                    unidad_medida=unidad_medida,
                     detalle=line.name,
-                    precio_unitario=Decimal(str(line.price_unit)),
+                    precio_unitario=price_unit,
                     monto_total=line_total_amount,
                     sub_total=line_subtotal,
                     base_imponible=line_subtotal,
@@ -393,12 +647,22 @@ class AccountMove(models.Model):
                 self.company_id,
                 self.invoice_date or fields.Date.context_today(self),
             )
-            conversion_rate = Decimal(str(rate))
-
-        total_venta = Decimal(str(self.amount_untaxed or 0))
-        total_impuestos = Decimal(str(self.amount_tax or 0))
-        total_comprobante = Decimal(str(self.amount_total or 0))
-        total_venta_neta = max(total_venta - total_descuentos, Decimal("0"))
+            conversion_rate = _to_decimal(rate)
+
+        total_venta = _to_decimal(self.amount_untaxed)
+        total_impuestos = _to_decimal(self.amount_tax)
+        total_comprobante = _to_decimal(self.amount_total)
+        total_venta_neta = max(total_venta - total_descuentos, _ZERO)
+        total_serv_gravados = group_subtotals[True, "gravado"]
+        total_serv_exentos = group_subtotals[True, "exento"]
+        total_serv_exonerado = group_subtotals[True, "exonerado"]
+        total_serv_no_sujeto = group_subtotals[True, "no_sujeto"]
+        total_serv_otros = group_subtotals[True, "otros"]
+        total_mercancias_gravadas = group_subtotals[False, "gravado"]
+        total_mercancias_exentas = group_subtotals[False, "exento"]
+        total_mercancias_exoneradas = group_subtotals[False, "exonerado"]
+        total_mercancias_no_sujeto = group_subtotals[False, "no_sujeto"]
+        total_mercancias_otros = group_subtotals[False, "otros"]
         total_gravado = total_serv_gravados + total_mercancias_gravadas
         total_exento = total_serv_exentos + total_mercancias_exentas
         total_exonerado = total_serv_exonerado + total_mercancias_exoneradas
@@ -455,10 +719,45 @@ class AccountMove(models.Model):
         self.cr_consecutive_number = consecutivo
         return invoice
 
-    def _ensure_cr_document(self, xml_bytes, filename):
+    def _validate_cr_invoice(self, invoice):
+        """Valida el comprobante una sola vez antes de renderizarlo.
+
+        Los procesos por lotes que ya validaron sus datos pueden omitir este
+        paso con el contexto ``cr_skip_validation``. Devuelve si se validó.
+        """
+        if self.env.context.get("cr_skip_validation"):
+            return False
+        try:
+            validate_invoice(invoice)
+        except ValidationError as exc:
+            raise UserError(_("La factura no cumple con los anexos 4.4: %s") % exc) from exc
+        return True
+
+    def _get_cr_reusable_documents(self):
+        """Devuelve ``{move_id: documento}`` con el último documento sobrescribible.
+
+        Una sola consulta agrupada resuelve todo el lote; los ids crecen con
+        la fecha de creación, así que el mayor id es el más reciente.
+        """
+        Document = self.env["fe.cr.document"]
+        groups = Document._read_group(
+            [("move_id", "in", self.ids), ("state", "in", _REUSABLE_DOCUMENT_STATES)],
+            ["move_id"],
+            ["id:max"],
+        )
+        # Un solo ``browse`` para que los documentos compartan el prefetch.
+        documents = Document.browse([document_id for _move, document_id in groups])
+        return {move.id: document for (move, _document_id), document in zip(groups, documents)}
+
+    def _get_cr_reusable_document(self):
+        """Devuelve el documento más reciente que aún puede sobrescribirse."""
+        self.ensure_one()
+        return self._get_cr_reusable_documents().get(self.id, self.env["fe.cr.document"])
+
+    def _ensure_cr_document(self, xml_bytes, filename, document=None):
         self.ensure_one()
-        documents = self.cr_document_ids.filtered(lambda d: d.state in {"draft", "generated", "error"})
-        document = documents.sorted(key=lambda d: d.create_date or fields.Datetime.now(), reverse=True)[:1]
+        if document is None:
+            document = self._get_cr_reusable_document()
         if document:
             document.write(
                 {
@@ -473,56 +772,29 @@ class AccountMove(models.Model):
             filename,
         )
 
-    def _ensure_cr_credentials(self):
-        for move in self:
-            company = move.company_id
-            missing = []
-            if not company.cr_hacienda_username:
-                missing.append(_("Usuario Hacienda"))
-            if not company.cr_hacienda_password:
-                missing.append(_("Contraseña Hacienda"))
-            if not company.cr_certificate_p12:
-                missing.append(_("Certificado P12 Hacienda"))
-            if not company.cr_certificate_password:
-                missing.append(_("Contraseña certificado"))
-            if missing:
-                raise UserError(
-                    _(
-                        "La compañía %s no tiene configurados los credenciales requeridos: %s"
-                    )
-                    % (company.name, ", ".join(missing))
-                )
-        return True
-
     def _sign_cr_xml(self, xml_bytes: bytes) -> bytes:
         self.ensure_one()
         company = self.company_id
         try:
-            certificate_bytes = base64.b64decode(company.cr_certificate_p12)
+            certificate_bytes = _decode_certificate(company.cr_certificate_p12)
         except Exception as exc:  # pragma: no cover - casos extremos
             raise UserError(_("El certificado P12 es inválido")) from exc
         password = company.cr_certificate_password or ""
         return sign_xml_with_p12(xml_bytes, certificate_bytes, password)
 
     def _parse_payment_methods(self):
-        codes = (self.cr_payment_methods or "01").split(",")
-        methods = []
-        for code in codes:
-            code = code.strip()
-            try:
-                methods.append(PaymentMethod(code or "01"))
-            except ValueError:
-                continue
-        return methods or [PaymentMethod.EFECTIVO]
+        return _parse_payment_methods_cached(self.cr_payment_methods or "01")
 
     def _generate_cr_key(self) -> str:
         date = fields.Date.to_date(self.invoice_date or fields.Date.context_today(self))
-        date_str = date.strftime("%d%m%y")
         identifier = (self.company_id.cr_identification_number or "000000000").zfill(12)
         consecutive = (self.cr_consecutive_number or str(self.id)).zfill(20)
-        security_code = f"{self.id:08d}"[-8:]
+        security_code = self.id % 100_000_000  # últimos 8 dígitos del id
         situation = "1"
-        return f"506{date_str}{identifier}{consecutive}{security_code}{situation}"
+        return (
+            f"506{date.day:02d}{date.month:02d}{date.year % 100:02d}"
+            f"{identifier}{consecutive}{security_code:08d}{situation}"
+        )
 
     def _generate_cr_consecutive(self) -> str:
         journal_code = (self.journal_id.code or "001")[:3].rjust(3, "0")
@@ -1,6 +1,7 @@
 import base64
+import json
 
-from odoo import Command, _, api, fields, models
+from odoo import _, api, fields, models
 
 
 class ElectronicDocument(models.Model):
@@ -28,29 +29,62 @@ class ElectronicDocument(models.Model):
         ],
         default="draft",
         string="Estado",
-        tracking=True,
     )
     xml_comprobante = fields.Binary(string="XML Comprobante", attachment=True)
     xml_respuesta = fields.Binary(string="XML Respuesta", attachment=True)
     xml_filename = fields.Char(string="Nombre del XML")
     message = fields.Text(string="Mensaje de Hacienda")
+    message_pretty = fields.Text(string="Mensaje de Hacienda", compute="_compute_message_pretty")
     sent_date = fields.Datetime(string="Fecha de envío")
     response_date = fields.Datetime(string="Fecha de respuesta")
+    fingerprint = fields.Char(
+        string="Huella del comprobante",
+        index=True,
+        copy=False,
+        help="Huella de los datos de la factura con los que se generó el XML.",
+    )
+
+    @api.depends("message")
+    def _compute_message_pretty(self):
+        # Las respuestas se guardan como JSON compacto; sólo se indentan al
+        # mostrarlas.
+        for document in self:
+            try:
+                document.message_pretty = json.dumps(json.loads(document.message), ensure_ascii=False, indent=2)
+            except (TypeError, ValueError):
+                document.message_pretty = document.message
 
     @api.model
-    def create_from_invoice(self, move, xml_content, filename):
+    def _prepare_invoice_document_vals(self, move, xml_content, filename, fingerprint=False):
         if isinstance(xml_content, str):
             xml_bytes = xml_content.encode("utf-8")
         else:
             xml_bytes = xml_content
-        document = self.create(
-            {
-                "name": filename,
-                "move_id": move.id,
-                "state": "generated",
-                "xml_comprobante": base64.b64encode(xml_bytes),
-                "xml_filename": filename,
-            }
+        return {
+            "name": filename,
+            "move_id": move.id,
+            "state": "generated",
+            # Los campos Binary reciben base64: Odoo lo guarda tal cual como
+            # ``datas`` del adjunto y lo decodifica una sola vez al almacenar.
+            "xml_comprobante": base64.b64encode(xml_bytes),
+            "xml_filename": filename,
+            "fingerprint": fingerprint,
+        }
+
+    @api.model
+    def create_from_invoices(self, moves_xml):
+        """Crea en un solo ``INSERT`` los documentos de ``(move, xml, filename, fingerprint)``.
+
+        El resultado conserva el orden de las tuplas recibidas.
+        """
+        # ``move_id`` ya enlaza cada documento en ``move.cr_document_ids``.
+        return self.create(
+            [
+                self._prepare_invoice_document_vals(move, xml_content, filename, fingerprint)
+                for move, xml_content, filename, fingerprint in moves_xml
+            ]
         )
-        move.cr_document_ids = [Command.link(document.id)]
-        return document
+
+    @api.model
+    def create_from_invoice(self, move, xml_content, filename, fingerprint=False):
+        return self.create_from_invoices([(move, xml_content, filename, fingerprint)])
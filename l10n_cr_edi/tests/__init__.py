@@ -0,0 +1,2 @@
+from . import test_cr_payload_fingerprint
+from . import test_send_cr_xml
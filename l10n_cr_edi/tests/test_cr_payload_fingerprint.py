@@ -0,0 +1,45 @@
+from datetime import datetime
+from decimal import Decimal
+
+from fe_cr import Discount, ElectronicInvoice, Emisor, Identification, InvoiceLine, InvoiceSummary, SaleCondition
+from odoo.addons.l10n_cr_edi.models.account_move import _cr_payload_fingerprint
+from odoo.tests import BaseCase, tagged
+
+
+def _invoice(naturaleza):
+    line = InvoiceLine(
+        numero_linea=1,
+        cantidad=Decimal("1"),
+        unidad_medida="Unid",
+        detalle="Servicio",
+        precio_unitario=Decimal("100"),
+        monto_total=Decimal("100"),
+        sub_total=Decimal("90"),
+        descuento=Discount(monto=Decimal("10"), naturaleza=naturaleza),
+    )
+    return ElectronicInvoice(
+        clave="5" * 50,
+        codigo_actividad="62010",
+        numero_consecutivo="0" * 20,
+        fecha_emision=datetime(2024, 1, 1),
+        emisor=Emisor(nombre="Emisor", identificacion=Identification(tipo="02", numero="3101123456")),
+        condicion_venta=SaleCondition.CONTADO,
+        detalle_servicio=[line],
+        resumen=InvoiceSummary(moneda="CRC"),
+    )
+
+
+@tagged("post_install", "-at_install")
+class TestCrPayloadFingerprint(BaseCase):
+    def test_fingerprint_ignores_user_language(self):
+        self.assertEqual(
+            _cr_payload_fingerprint(_invoice("Descuento de línea"), validated=True),
+            _cr_payload_fingerprint(_invoice("Line discount"), validated=True),
+        )
+
+    def test_fingerprint_records_validation(self):
+        invoice = _invoice("Descuento de línea")
+        self.assertNotEqual(
+            _cr_payload_fingerprint(invoice, validated=True),
+            _cr_payload_fingerprint(invoice, validated=False),
+        )
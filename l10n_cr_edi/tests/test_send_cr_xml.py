@@ -0,0 +1,94 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from fe_cr import HaciendaAPIError
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.addons.l10n_cr_edi.models import account_move as account_move_module
+from odoo.tests import tagged
+
+AccountMove = account_move_module.AccountMove
+
+
+class StubHaciendaAPI:
+    """Cliente de Hacienda que rechaza las claves de ``failing_keys``."""
+
+    failing_keys = frozenset()
+    submitted = None
+
+    def __init__(self, environment="sandbox"):
+        self.environment = environment
+
+    def authenticate(self, username, password):
+        return "token"
+
+    def submit_invoice(self, invoice, xml=None):
+        self.submitted.append((invoice.clave, threading.get_ident()))
+        if invoice.clave in self.failing_keys:
+            raise HaciendaAPIError("Comprobante duplicado", status_code=400, payload={"detalle": "duplicado"})
+        return {"clave": invoice.clave, "estado": "recibido"}
+
+
+@tagged("post_install", "-at_install")
+class TestSendCrXml(AccountTestInvoicingCommon):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.moves = cls.env["account.move"]
+        for _index in range(3):
+            cls.moves |= cls.init_invoice("out_invoice", amounts=[100.0], post=True)
+
+    def _send(self, failing_moves, **context):
+        failing_keys = frozenset(failing_moves.mapped("name"))
+        self.submitted = []
+        api_class = type(
+            "FailingHaciendaAPI",
+            (StubHaciendaAPI,),
+            {"failing_keys": failing_keys, "submitted": self.submitted},
+        )
+        patches = [
+            patch.object(account_move_module, "HaciendaAPI", api_class),
+            patch.object(account_move_module, "render_invoice_bytes", lambda invoice, validate=False: b"<Factura/>"),
+            patch.object(AccountMove, "_ensure_cr_setup", lambda self, require_credentials=False: None),
+            patch.object(AccountMove, "_prepare_cr_invoice_payload", lambda self: SimpleNamespace(clave=self.name)),
+            patch.object(AccountMove, "_validate_cr_invoice", lambda self, invoice: None),
+            patch.object(AccountMove, "_sign_cr_xml", lambda self, xml_bytes: xml_bytes),
+        ]
+        for patcher in patches:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        return self.moves.with_context(**context).action_send_cr_xml()
+
+    def _assert_partial_failure(self, result, failing_move):
+        self.assertEqual(result["tag"], "display_notification")
+        self.assertIn(failing_move.display_name, result["params"]["message"])
+        self.assertEqual(failing_move.cr_electronic_state, "error")
+        self.assertEqual(failing_move.cr_document_ids.state, "error")
+
+    def test_parallel_failure_keeps_accepted_invoices_sent(self):
+        failing_move = self.moves[1]
+        with patch.object(account_move_module, "ThreadPoolExecutor", wraps=ThreadPoolExecutor) as pool_class:
+            result = self._send(failing_move, cr_submit_max_workers=4)
+
+        pool_class.assert_called_once_with(max_workers=4)
+        # Todas las facturas se enviaron desde el pool, no desde el hilo del ORM.
+        self.assertCountEqual([clave for clave, _thread in self.submitted], self.moves.mapped("name"))
+        self.assertNotIn(threading.get_ident(), {thread for _clave, thread in self.submitted})
+        self._assert_partial_failure(result, failing_move)
+        self.assertIn("duplicado", failing_move.cr_document_ids.message)
+        for move in self.moves - failing_move:
+            self.assertEqual(move.cr_electronic_state, "sent")
+            self.assertEqual(move.cr_document_ids.state, "sent")
+            self.assertTrue(move.cr_document_ids.sent_date)
+
+    def test_serial_failure_stops_dispatch(self):
+        failing_move = self.moves[1]
+        result = self._send(failing_move)
+
+        self._assert_partial_failure(result, failing_move)
+        self.assertEqual(self.moves[0].cr_electronic_state, "sent")
+        self.assertEqual(self.moves[0].cr_document_ids.state, "sent")
+        # La tercera factura no llegó a enviarse.
+        self.assertNotEqual(self.moves[2].cr_electronic_state, "sent")
+        self.assertIn("1 factura(s) no se enviaron", result["params"]["message"])
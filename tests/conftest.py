@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+from pathlib import Path
+import sys
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives.serialization import pkcs12
+
+# Permite importar ``fe_cr`` desde el checkout sin instalar el paquete.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Fechas fijas: el certificado sólo varía por la llave y el serial.
+_NOW = datetime(2024, 1, 1)
+
+
+def _build_key_and_certificate():
+    # Llave sólo para pruebas: 1024 bits bastan para el viaje de firma y la
+    # generación es mucho más rápida. La firma exige RSA, no Ed25519.
+    key = rsa.generate_private_key(public_exponent=65537, key_size=1024)
+    subject = issuer = x509.Name(
+        [
+            x509.NameAttribute(x509.oid.NameOID.COUNTRY_NAME, "CR"),
+            x509.NameAttribute(x509.oid.NameOID.ORGANIZATION_NAME, "Test"),
+            x509.NameAttribute(x509.oid.NameOID.COMMON_NAME, "Test Cert"),
+        ]
+    )
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(subject)
+        .issuer_name(issuer)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(_NOW - timedelta(days=1))
+        .not_valid_after(_NOW + timedelta(days=3650))
+        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
+        .sign(key, hashes.SHA256())
+    )
+    return key, certificate
+
+
+def _build_p12(key, certificate, password: str) -> bytes:
+    return pkcs12.serialize_key_and_certificates(
+        name=b"test",
+        key=key,
+        cert=certificate,
+        cas=None,
+        encryption_algorithm=serialization.BestAvailableEncryption(password.encode()),
+    )
+
+
+@pytest.fixture(scope="session")
+def key_and_certificate():
+    """Par ``(llave, certificado)`` autofirmado compartido por toda la sesión.
+
+    Las pruebas que necesiten otra contraseña sólo vuelven a empaquetarlo con
+    ``_build_p12``, sin generar otra llave.
+    """
+
+    return _build_key_and_certificate()
+
+
+@pytest.fixture(scope="session")
+def p12_bytes(key_and_certificate) -> bytes:
+    """Certificado de prueba con contraseña ``"1234"``.
+
+    Empaqueta la llave de ``key_and_certificate``: no genera otra.
+    """
+
+    return _build_p12(*key_and_certificate, "1234")
@@ -1,12 +1,10 @@
-from datetime import datetime
+import base64
+import email
+from datetime import date, datetime
 from decimal import Decimal
-from pathlib import Path
-import sys
 
 import pytest
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-
 from fe_cr import (
     ElectronicInvoice,
     Emisor,
@@ -19,6 +17,7 @@ from fe_cr import (
     Receptor,
     SaleCondition,
     Tax,
+    ValidationError,
 )
 
 
@@ -135,6 +134,28 @@ def test_submit_invoice_uses_base64(invoice):
     assert headers["Authorization"] == "Bearer abc"
 
 
+def test_submit_invoice_encodes_given_xml(invoice):
+    session = DummySession()
+    api = HaciendaAPI(environment="testing", session=session)
+    api.set_token("abc")
+    signed_xml = "<?xml version='1.0' encoding='utf-8'?>\n<FacturaElectronica>ñ</FacturaElectronica>".encode("utf-8")
+
+    api.submit_invoice(invoice, xml=signed_xml)
+
+    _, _, payload, _ = session.requests[0]
+    assert isinstance(payload["comprobanteXml"], str)
+    assert base64.b64decode(payload["comprobanteXml"]) == signed_xml
+
+
+def test_submit_invoice_rejects_date_without_time(invoice):
+    api = HaciendaAPI(environment="testing", session=DummySession())
+    api.set_token("abc")
+    invoice.fecha_emision = date(2023, 8, 1)
+
+    with pytest.raises(ValidationError):
+        api.submit_invoice(invoice, xml=b"<FacturaElectronica/>")
+
+
 def test_fetch_status(invoice):
     session = DummySession()
     session.next_response = DummyResponse(json_data={"estado": "procesando"})
@@ -148,3 +169,17 @@ def test_fetch_status(invoice):
     assert method == "GET"
     assert invoice.clave in url
     assert headers["Authorization"] == "Bearer abc"
+
+
+def test_shared_requests_session_rejects_cookies():
+    requests = pytest.importorskip("requests")
+    from requests.cookies import MockRequest, MockResponse
+
+    from fe_cr.hacienda_api import _RequestsSession
+
+    session = _RequestsSession()
+    prepared = requests.Request("POST", "https://api-sandbox.comprobanteselectronicos.go.cr/recepcion/v1/recepcion").prepare()
+    headers = email.message_from_string("Set-Cookie: SESSION=emisor-1; Path=/\n\n")
+    session._session.cookies.extract_cookies(MockResponse(headers), MockRequest(prepared))
+
+    assert len(session._session.cookies) == 0
@@ -1,10 +1,6 @@
 from dataclasses import fields
-from pathlib import Path
-import sys
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
-
-from fe_cr.models import ElectronicInvoice, InvoiceLine, InvoiceSummary
+from fe_cr.models import ElectronicInvoice, InvoiceLine, InvoiceSummary, PaymentMethod
 
 
 def test_invoice_line_codigo_optional_default_none():
@@ -22,3 +18,24 @@ def test_electronic_invoice_optional_defaults_align_with_odoo_structure():
     assert invoice_fields["receptor"].default is None
     assert invoice_fields["plazo_credito"].default is None
     assert invoice_fields["medios_pago"].default_factory() == tuple()
+
+
+def test_electronic_invoice_sorts_payment_methods_on_demand():
+    assert [f.name for f in fields(ElectronicInvoice) if f.name.startswith("_")] == []
+    medios = [PaymentMethod.TARJETA, PaymentMethod.EFECTIVO, PaymentMethod.TARJETA]
+    invoice = ElectronicInvoice(
+        clave="",
+        codigo_actividad="",
+        numero_consecutivo="",
+        fecha_emision=None,
+        emisor=None,
+        condicion_venta=None,
+        detalle_servicio=[],
+        resumen=None,
+        medios_pago=medios,
+    )
+    assert invoice.medios_pago == tuple(medios)
+    assert invoice.sorted_medios_pago() == (PaymentMethod.EFECTIVO, PaymentMethod.TARJETA)
+
+    invoice.medios_pago = [PaymentMethod.CHEQUE, PaymentMethod.EFECTIVO, PaymentMethod.CHEQUE]
+    assert invoice.sorted_medios_pago() == (PaymentMethod.EFECTIVO, PaymentMethod.CHEQUE)
@@ -1,70 +1,99 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
-
 import base64
+import hashlib
 
 from cryptography import x509
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import padding, rsa
-from cryptography.hazmat.primitives.serialization import pkcs12
+from cryptography.hazmat.primitives.asymmetric import padding
 
 from lxml import etree
+import pytest
 
-from fe_cr.signing import sign_xml_with_p12
+from fe_cr.signing import CertificateError, _digest_base64, _load_pkcs12, sign_xml_with_key_cert, sign_xml_with_p12
 
+DS_NS = "http://www.w3.org/2000/09/xmldsig#"
+DS_SIGNATURE = f"{{{DS_NS}}}Signature"
+DS_SIGNED_INFO = f"{{{DS_NS}}}SignedInfo"
+DS_SIGNATURE_VALUE = f"{{{DS_NS}}}SignatureValue"
+DS_DIGEST_VALUE = f"{{{DS_NS}}}DigestValue"
+DS_X509_CERTIFICATE = f"{{{DS_NS}}}X509Certificate"
 
-def _build_p12(password: str) -> bytes:
-    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
-    subject = issuer = x509.Name(
-        [
-            x509.NameAttribute(x509.oid.NameOID.COUNTRY_NAME, "CR"),
-            x509.NameAttribute(x509.oid.NameOID.ORGANIZATION_NAME, "Test"),
-            x509.NameAttribute(x509.oid.NameOID.COMMON_NAME, "Test Cert"),
-        ]
-    )
-    certificate = (
-        x509.CertificateBuilder()
-        .subject_name(subject)
-        .issuer_name(issuer)
-        .public_key(key.public_key())
-        .serial_number(x509.random_serial_number())
-        .not_valid_before(datetime.utcnow() - timedelta(days=1))
-        .not_valid_after(datetime.utcnow() + timedelta(days=1))
-        .add_extension(x509.BasicConstraints(ca=True, path_length=None), critical=True)
-        .sign(key, hashes.SHA256())
-    )
-    return pkcs12.serialize_key_and_certificates(
-        name=b"test",
-        key=key,
-        cert=certificate,
-        cas=None,
-        encryption_algorithm=serialization.BestAvailableEncryption(password.encode()),
-    )
 
+SAMPLE_XML = b"""
+    <FacturaElectronica xmlns="https://cdn.comprobanteselectronicos.go.cr/xml-schemas/v4.4/facturaElectronica">
+        <Clave>50602022300310112345600100001010000000012100000001</Clave>
+    </FacturaElectronica>
+""".strip()
 
-def test_sign_xml_with_p12_creates_valid_signature():
-    xml_content = """
-        <FacturaElectronica xmlns="https://cdn.comprobanteselectronicos.go.cr/xml-schemas/v4.4/facturaElectronica">
-            <Clave>50602022300310112345600100001010000000012100000001</Clave>
-        </FacturaElectronica>
-    """.strip()
-    p12_bytes = _build_p12("1234")
 
-    signed = sign_xml_with_p12(xml_content, p12_bytes, "1234")
+def test_sign_xml_with_p12_creates_valid_signature(p12_bytes):
+    signed = sign_xml_with_p12(SAMPLE_XML, p12_bytes, "1234")
 
     assert b"Signature" in signed
 
     _assert_signature_valid(signed)
 
 
+def test_sign_xml_with_key_cert_creates_valid_signature(key_and_certificate):
+    key, certificate = key_and_certificate
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+
+    signed = sign_xml_with_key_cert(SAMPLE_XML, key_pem, certificate.public_bytes(serialization.Encoding.PEM))
+
+    _assert_signature_valid(signed)
+
+
+def test_sign_xml_with_key_cert_rejects_invalid_pem(key_and_certificate):
+    key, certificate = key_and_certificate
+    certificate_pem = certificate.public_bytes(serialization.Encoding.PEM)
+    encrypted_key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.BestAvailableEncryption(b"1234"),
+    )
+
+    with pytest.raises(CertificateError):
+        sign_xml_with_key_cert(SAMPLE_XML, encrypted_key_pem, certificate_pem, password="incorrecta")
+    with pytest.raises(CertificateError):
+        sign_xml_with_key_cert(SAMPLE_XML, b"no es PEM", certificate_pem)
+    with pytest.raises(CertificateError):
+        sign_xml_with_key_cert(SAMPLE_XML, encrypted_key_pem, b"no es PEM", password="1234")
+
+
+def test_digest_base64_matches_sha256_vectors():
+    assert _digest_base64(b"") == "47DEQpj8HBSa+/TImW+5JCeuQeRkm5NMpJWZG3hSuFU="
+    assert _digest_base64(b"abc") == "ungWv48Bz+pBQUDeXa4iI7ADYaOWF3qctBD/YfIAFa0="
+
+
+def test_load_pkcs12_reuses_decrypted_certificate(p12_bytes):
+    first = _load_pkcs12(p12_bytes, "1234")
+    second = _load_pkcs12(p12_bytes, b"1234")
+
+    assert second is first
+
+
 def _assert_signature_valid(signed_xml: bytes) -> None:
     root = etree.fromstring(signed_xml)
-    ds_ns = "http://www.w3.org/2000/09/xmldsig#"
-    signature_el = root.find(f".//{{{ds_ns}}}Signature")
+    # Un solo recorrido localiza todos los nodos de la firma (el primero de cada tipo).
+    nodes = {}
+    for element in root.iter(
+        DS_SIGNATURE,
+        DS_SIGNED_INFO,
+        DS_SIGNATURE_VALUE,
+        DS_DIGEST_VALUE,
+        DS_X509_CERTIFICATE,
+    ):
+        nodes.setdefault(element.tag, element)
+
+    signature_el = nodes.get(DS_SIGNATURE)
     assert signature_el is not None
 
-    signed_info = signature_el.find(f"{{{ds_ns}}}SignedInfo")
+    signed_info = nodes.get(DS_SIGNED_INFO)
     assert signed_info is not None
 
     signed_info_c14n = etree.tostring(
@@ -74,13 +103,13 @@ def _assert_signature_valid(signed_xml: bytes) -> None:
         with_comments=False,
     )
 
-    signature_value_el = signature_el.find(f"{{{ds_ns}}}SignatureValue")
+    signature_value_el = nodes.get(DS_SIGNATURE_VALUE)
     assert signature_value_el is not None and signature_value_el.text
     signature_value = base64.b64decode(signature_value_el.text)
 
-    cert_text = signature_el.findtext(f"{{{ds_ns}}}KeyInfo/{{{ds_ns}}}X509Data/{{{ds_ns}}}X509Certificate")
-    assert cert_text
-    cert = x509.load_der_x509_certificate(base64.b64decode(cert_text))
+    cert_el = nodes.get(DS_X509_CERTIFICATE)
+    assert cert_el is not None and cert_el.text
+    cert = x509.load_der_x509_certificate(base64.b64decode(cert_el.text))
 
     cert.public_key().verify(
         signature_value,
@@ -89,24 +118,18 @@ def _assert_signature_valid(signed_xml: bytes) -> None:
         hashes.SHA256(),
     )
 
-    digest_value_text = signature_el.findtext(
-        f"{{{ds_ns}}}SignedInfo/{{{ds_ns}}}Reference/{{{ds_ns}}}DigestValue"
-    )
-    assert digest_value_text
-    expected_digest = base64.b64decode(digest_value_text)
+    digest_el = nodes.get(DS_DIGEST_VALUE)
+    assert digest_el is not None and digest_el.text
+    expected_digest = base64.b64decode(digest_el.text)
 
-    root_without_signature = etree.fromstring(signed_xml)
-    signature_to_remove = root_without_signature.find(f".//{{{ds_ns}}}Signature")
-    assert signature_to_remove is not None
-    signature_to_remove.getparent().remove(signature_to_remove)
+    # Los valores ya se extrajeron: la firma se retira del mismo árbol.
+    signature_el.getparent().remove(signature_el)
 
     canonical = etree.tostring(
-        root_without_signature,
+        root,
         method="c14n",
         exclusive=True,
         with_comments=False,
     )
 
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(canonical)
-    assert digest.finalize() == expected_digest
+    assert hashlib.sha256(canonical).digest() == expected_digest
@@ -0,0 +1,56 @@
+from decimal import Decimal
+
+import pytest
+
+from fe_cr import Identification, InvoiceLine, Tax, ValidationError
+from fe_cr.validation import validate_identification, validate_invoice_line
+
+
+def _line(**overrides) -> InvoiceLine:
+    values = dict(
+        numero_linea=1,
+        cantidad=Decimal("1"),
+        unidad_medida="Unid",
+        detalle="Servicio",
+        precio_unitario=Decimal("100"),
+        monto_total=Decimal("100"),
+        sub_total=Decimal("100"),
+        impuesto=Tax(codigo="01", tarifa=Decimal("13"), monto=Decimal("13")),
+    )
+    values.update(overrides)
+    return InvoiceLine(**values)
+
+
+def test_validate_invoice_line_accepts_valid_line():
+    validate_invoice_line(_line())
+
+
+@pytest.mark.parametrize(
+    "overrides, field",
+    [
+        ({"numero_linea": 0}, "NumeroLinea"),
+        ({"cantidad": Decimal("-1")}, "Cantidad"),
+        ({"precio_unitario": Decimal("-1")}, "PrecioUnitario"),
+        ({"monto_total": Decimal("-1")}, "MontoTotal"),
+        ({"sub_total": Decimal("-1")}, "SubTotal"),
+        ({"base_imponible": Decimal("-1")}, "BaseImponible"),
+        ({"impuesto": Tax(codigo="01", tarifa=Decimal("13"), monto=Decimal("-1"))}, "Impuesto/Monto"),
+        ({"impuesto": Tax(codigo="01", tarifa=Decimal("101"), monto=Decimal("1"))}, "Impuesto/Tarifa"),
+    ],
+)
+def test_validate_invoice_line_reports_invalid_field(overrides, field):
+    with pytest.raises(ValidationError) as excinfo:
+        validate_invoice_line(_line(**overrides))
+    assert excinfo.value.field == field
+
+
+@pytest.mark.parametrize("numero", ["101230123", "3101123456", "A1B2C3D4E5"])
+def test_validate_identification_accepts_ascii_alphanumeric(numero):
+    validate_identification(Identification(tipo="01", numero=numero), field="Receptor/Identificacion")
+
+
+@pytest.mark.parametrize("numero", ["12345678", "1" * 21, "10123-0123", "10123012³", "1012301ñ3"])
+def test_validate_identification_rejects_invalid_number(numero):
+    with pytest.raises(ValidationError) as excinfo:
+        validate_identification(Identification(tipo="01", numero=numero), field="Receptor/Identificacion")
+    assert excinfo.value.field == "Receptor/Identificacion"
@@ -1,23 +1,34 @@
 from datetime import datetime
 from decimal import Decimal
-from pathlib import Path
-import sys
-from xml.etree import ElementTree as ET
 
-sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+import pytest
+from lxml import etree as ET
 
 from fe_cr import (
+    Discount,
     ElectronicInvoice,
     Emisor,
     Identification,
     InvoiceLine,
     InvoiceSummary,
+    Location,
+    OtherCharge,
     PaymentMethod,
+    Phone,
     Receptor,
+    ReferenceInformation,
     SaleCondition,
     Tax,
+    TaxExoneration,
+)
+from fe_cr import xml_builder
+from fe_cr.xml_builder import (
+    _decimal_to_text,
+    render_invoice,
+    render_invoice_bytes,
+    render_invoices_bytes,
+    stream_invoice,
 )
-from fe_cr.xml_builder import render_invoice
 
 NS = "{https://cdn.comprobanteselectronicos.go.cr/xml-schemas/v4.4/facturaElectronica}"
 
@@ -67,10 +78,21 @@ def _sample_invoice() -> ElectronicInvoice:
     )
 
 
-def test_render_invoice_generates_valid_xml():
-    invoice = _sample_invoice()
-    xml = render_invoice(invoice)
-    root = ET.fromstring(xml)
+@pytest.fixture(scope="module")
+def invoice() -> ElectronicInvoice:
+    # Compartido por las pruebas que sólo leen el comprobante; las que lo
+    # modifican construyen el suyo (más barato que ``copy.deepcopy``).
+    return _sample_invoice()
+
+
+@pytest.fixture(scope="module")
+def invoice_xml(invoice) -> str:
+    return render_invoice(invoice)
+
+
+def test_render_invoice_generates_valid_xml(invoice, invoice_xml):
+    # lxml no acepta ``str`` con declaración de codificación.
+    root = ET.fromstring(invoice_xml.encode("utf-8"))
 
     assert root.tag == f"{NS}FacturaElectronica"
     assert root.findtext(f"{NS}Clave") == invoice.clave
@@ -85,19 +107,226 @@ def test_render_invoice_generates_valid_xml():
     assert resumen.find(f"{NS}TotalComprobante").text == "113"
 
 
-def test_render_invoice_without_validation():
-    invoice = _sample_invoice()
+def test_render_invoice_without_validation(invoice):
     xml = render_invoice(invoice, validate=False)
     assert "FacturaElectronica" in xml
 
 
+def test_render_invoice_bytes_matches_text_rendering(invoice, invoice_xml):
+    xml_bytes = render_invoice_bytes(invoice)
+    assert isinstance(xml_bytes, bytes)
+    assert xml_bytes == invoice_xml.encode("utf-8")
+
+
 def test_render_invoice_includes_extended_totals():
     invoice = _sample_invoice()
     invoice.resumen.total_serv_exonerado = Decimal("0.00")
     invoice.resumen.total_iva_devuelto = Decimal("0.00")
-    xml = render_invoice(invoice)
-    root = ET.fromstring(xml)
+    root = ET.fromstring(render_invoice_bytes(invoice))
 
     resumen = root.find(f"{NS}ResumenFactura")
     assert resumen.find(f"{NS}TotalServExonerado") is not None
     assert resumen.find(f"{NS}TotalIVADevuelto") is not None
+
+
+def test_decimal_to_text_cache_keeps_equal_values_apart():
+    assert _decimal_to_text(Decimal("0")) == "0"
+    assert _decimal_to_text(Decimal("-0")) == "-0"
+    assert _decimal_to_text(Decimal("0")) == "0"
+    assert _decimal_to_text(Decimal("1.10")) == _decimal_to_text(Decimal("1.1000")) == "1.1"
+    assert _decimal_to_text(Decimal("0.123456"), places=2) == "0.12"
+    assert _decimal_to_text(Decimal("0.123456")) == "0.12346"
+
+
+def test_render_invoice_line_total_includes_other_charges():
+    invoice = _sample_invoice()
+    cargo = OtherCharge(
+        tipo_documento="04",
+        numero_documento="1",
+        nombre_institucion="Servicio",
+        fecha_emision=datetime(2023, 8, 1, 12, 0, 0),
+        monto_cargo=Decimal("5.50"),
+    )
+    line = invoice.detalle_servicio[0]
+    line.descuento = Discount(monto=Decimal("10"), naturaleza="Promoción")
+    line.otros_cargos = (cargo, cargo)
+    root = ET.fromstring(render_invoice_bytes(invoice))
+
+    linea = root.find(f"{NS}DetalleServicio/{NS}LineaDetalle")
+    assert len(linea.findall(f"{NS}OtroCargo")) == 2
+    # 100 (subtotal) + 13 (impuesto) - 10 (descuento) + 2 * 5.50 (cargos)
+    assert linea.findtext(f"{NS}MontoTotalLinea") == "114"
+
+
+def test_render_invoices_bytes_sequential_and_parallel_agree(invoice, monkeypatch):
+    invoices = [invoice, invoice]
+    expected = [render_invoice_bytes(invoice) for invoice in invoices]
+
+    assert render_invoices_bytes(invoices) == expected
+
+    monkeypatch.setattr(xml_builder, "_PARALLEL_RENDER_THRESHOLD", 2)
+    assert render_invoices_bytes(invoices, max_workers=2) == expected
+
+
+def test_stream_invoice_matches_tree_rendering():
+    invoice = _sample_invoice()
+    line = invoice.detalle_servicio[0]
+    line.detalle = "Servicio <A&B>\r\n"
+    line.descuento = Discount(monto=Decimal("10"), naturaleza="Promoción")
+    invoice.receptor.identificacion_extranjero = "P-123"
+
+    out = bytearray(b"prefijo")
+    stream_invoice(invoice, out)
+
+    assert bytes(out) == b"prefijo" + render_invoice_bytes(invoice)
+
+
+_FECHA = datetime(2023, 8, 1, 12, 0, 0)
+_CARGO = OtherCharge(
+    tipo_documento="04",
+    numero_documento="1",
+    nombre_institucion="Cruz Roja",
+    fecha_emision=_FECHA,
+    monto_cargo=Decimal("5.50"),
+)
+
+
+def _foreign_receiver(invoice):
+    invoice.receptor = Receptor(
+        nombre="Client Inc.",
+        identificacion_extranjero="P-123",
+        nombre_comercial="Client",
+        telefono=Phone(codigo_pais="1", numero="5551234"),
+        correo_electronico="ap@client.example",
+    )
+
+
+def _no_receiver(invoice):
+    invoice.receptor = None
+
+
+def _full_emitter(invoice):
+    invoice.emisor.nombre_comercial = "Mi Empresa"
+    invoice.emisor.ubicacion = Location(
+        provincia="1", canton="01", distrito="01", barrio="01", otras_senas="Frente al parque"
+    )
+    invoice.emisor.telefono = Phone(codigo_pais="506", numero="22223333")
+    invoice.emisor.fax = Phone(codigo_pais="506", numero="22224444")
+    invoice.emisor.correo_electronico = "facturas@empresa.example"
+
+
+def _exoneration(invoice):
+    line = invoice.detalle_servicio[0]
+    line.base_imponible = Decimal("100.00")
+    line.impuesto = Tax(
+        codigo="01",
+        codigo_tarifa="08",
+        tarifa=Decimal("13"),
+        monto=Decimal("13"),
+        factor_iva=Decimal("0.1300"),
+        exoneracion=TaxExoneration(
+            tipo_documento="03",
+            numero_documento="AL-001",
+            nombre_institucion="Ministerio de Hacienda",
+            fecha_emision=_FECHA,
+            porcentaje_exoneracion=Decimal("100"),
+            monto_exoneracion=Decimal("13"),
+        ),
+    )
+    line.impuesto_neto = Decimal("0")
+
+
+def _other_charges(invoice):
+    invoice.detalle_servicio[0].otros_cargos = (_CARGO,)
+    invoice.otros_cargos = (_CARGO, _CARGO)
+    invoice.resumen.total_otros_cargos = Decimal("11.00")
+
+
+def _several_payment_methods(invoice):
+    invoice.condicion_venta = SaleCondition.CREDITO
+    invoice.plazo_credito = "30"
+    invoice.medios_pago = [
+        PaymentMethod.TRANSFERENCIA_DEPOSITO,
+        PaymentMethod.EFECTIVO,
+        PaymentMethod.TARJETA,
+        PaymentMethod.EFECTIVO,
+    ]
+
+
+def _several_lines_and_references(invoice):
+    line = invoice.detalle_servicio[0]
+    extra = InvoiceLine(
+        numero_linea=2,
+        cantidad=Decimal("2.500"),
+        unidad_medida="kg",
+        detalle="Café & azúcar",
+        precio_unitario=Decimal("1234.56789"),
+        monto_total=Decimal("3086.419725"),
+        sub_total=Decimal("3086.42"),
+        descuento=Discount(monto=Decimal("86.42"), naturaleza="Cliente frecuente"),
+    )
+    invoice.detalle_servicio = [line, extra]
+    invoice.resumen.tipo_cambio = Decimal("506.12345")
+    invoice.informacion_referencia = (
+        ReferenceInformation(
+            tipo_documento="01",
+            numero_documento="50612122300310112345600100001010000000000111111111",
+            fecha_emision=_FECHA,
+            codigo="01",
+            razon="Anula <documento>",
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "shape",
+    [
+        _foreign_receiver,
+        _no_receiver,
+        _full_emitter,
+        _exoneration,
+        _other_charges,
+        _several_payment_methods,
+        _several_lines_and_references,
+    ],
+)
+def test_stream_invoice_matches_tree_rendering_for_invoice_shapes(shape):
+    invoice = _sample_invoice()
+    shape(invoice)
+
+    out = bytearray()
+    stream_invoice(invoice, out, validate=False)
+
+    assert bytes(out) == render_invoice_bytes(invoice, validate=False)
+
+
+def test_stream_invoice_renders_none_text_like_tree():
+    invoice = _sample_invoice()
+    invoice.codigo_actividad = None
+    invoice.detalle_servicio[0].detalle = None
+    invoice.detalle_servicio[0].unidad_medida = ""
+
+    out = bytearray()
+    stream_invoice(invoice, out, validate=False)
+
+    assert bytes(out) == render_invoice_bytes(invoice, validate=False)
+    assert b"<Detalle/>" in out
+
+
+@pytest.mark.parametrize("value", ["\x0b", "\x00", "a\x1fb", "\ufffe"])
+def test_stream_invoice_rejects_characters_outside_xml(value):
+    invoice = _sample_invoice()
+    invoice.detalle_servicio[0].detalle = value
+
+    with pytest.raises(ValueError):
+        render_invoice_bytes(invoice, validate=False)
+    with pytest.raises(ValueError):
+        stream_invoice(invoice, bytearray(), validate=False)
+
+
+def test_decimal_to_text_strips_zeros_without_scientific_notation():
+    assert _decimal_to_text(Decimal("100.00")) == "100"
+    assert _decimal_to_text(Decimal("1E+3")) == "1000"
+    assert _decimal_to_text(Decimal("-0.000001")) == "-0"
+    assert _decimal_to_text(Decimal("0.00000010"), places=8) == "0.0000001"
+    assert _decimal_to_text(Decimal("12.5"), places=0) == "13"